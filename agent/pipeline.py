@@ -1,18 +1,20 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, List, Optional
 
-import pandas as pd
+import numpy as np
 
 from agent.providers.base import FundamentalsProvider, MarketDataProvider, OptionsChainProvider
 from agent.providers.factory import build_fundamentals_provider, build_market_provider, build_options_provider
 from agent.recommendation.cc_recommender import build_cc_recommendations
-from agent.recommendation.csp_recommender import build_csp_recommendations, compute_ivr_proxy
+from agent.recommendation.csp_recommender import build_csp_recommendations, compute_hv_range, compute_ivr_proxy
 
-from agent.reporting.render import write_reports
-from agent.scoring.score import score_candidate
+from agent.reporting.render import candidates_frame, write_reports
+from agent.scoring.score import score_candidate, score_candidate_records, technical_levels
 from agent.signals.options_metrics import (
     build_option_records,
     get_dte,
@@ -44,7 +46,9 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "public_api_base_url": "https://api.public.com",
     "public_api_key_env_var": "PUBLIC_API_KEY",
     "public_access_token_validity_minutes": 15,
+    "public_token_refresh_skew_seconds": 30,
     "public_http_timeout_seconds": 20,
+    "public_max_inflight_requests": 16,
     "public_account_id": None,
     "public_underlying_instrument_type": "EQUITY",
     "min_annualized_yield": 0.12,
@@ -57,8 +61,11 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "output_dir": "./reports",
     "log_dir": "./logs",
     "cache_dir": "./cache",
+    "cache_ttl_minutes": 15,   # reuse yfinance responses from cache_dir (0 = disabled)
     "price_history_period": "6mo",
     "price_history_interval": "1d",
+    "max_workers": 8,          # tickers processed concurrently (network-bound)
+    "max_chain_workers": 4,    # option chains fetched concurrently per ticker
     "cc_recommendation": {
         "enabled": True,
         "max_recommendations": 50,
@@ -92,6 +99,52 @@ DISCLAIMER = (
 )
 
 
+# Below this many rows the per-row scorer is cheaper than the array setup.
+_VEC_SCORE_MIN_ROWS = 48
+
+
+def _score_rows(rows: List[Dict[str, Any]], technicals: Dict[str, float], config: Dict[str, Any]) -> None:
+    """Attach score and why_ranked_high to each candidate row in place."""
+    if len(rows) < _VEC_SCORE_MIN_ROWS:
+        levels = technical_levels(technicals)
+        for row in rows:
+            score, why = score_candidate(row, levels, config)
+            row["score"] = round(score, 4)
+            row["why_ranked_high"] = why
+        return
+
+    scores, whys = score_candidate_records(rows, technicals, config)
+    for row, score, why in zip(rows, scores.tolist(), whys):
+        row["score"] = round(score, 4)
+        row["why_ranked_high"] = why
+
+
+def _top_n_by_score(rows: List[Dict[str, Any]], n: int) -> List[Dict[str, Any]]:
+    """
+    Return the n highest-scoring rows, best first.
+
+    Uses np.partition to find the cut-off in O(N) and only sorts the winners.
+    Ties at the cut-off keep their original order, so the result is identical
+    to a stable sorted(..., reverse=True)[:n].
+    """
+    if len(rows) <= n:
+        return sorted(rows, key=lambda x: x.get("score", 0.0), reverse=True)
+    scores = np.fromiter((r.get("score", 0.0) for r in rows), dtype=float, count=len(rows))
+    cutoff = np.partition(scores, len(scores) - n)[len(scores) - n]
+    above = np.flatnonzero(scores > cutoff)
+    ties = np.flatnonzero(scores == cutoff)[: n - len(above)]
+    idx = np.concatenate([above, ties])
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [rows[i] for i in idx]
+
+
+def _decision_logger(options_provider: OptionsChainProvider, ticker: str) -> Optional[Callable[[dict], None]]:
+    """Bound row logger for a ticker, or None when the provider keeps the no-op hook."""
+    if type(options_provider).log_option_screen_result is OptionsChainProvider.log_option_screen_result:
+        return None
+    return partial(options_provider.log_option_screen_result, ticker)
+
+
 def _process_ticker(
     ticker: str,
     options_provider: OptionsChainProvider,
@@ -99,8 +152,10 @@ def _process_ticker(
     fundamentals_provider: FundamentalsProvider,
     config: Dict[str, Any],
     logger,
-    strategies: List[str],
+    strategies: AbstractSet[str],
+    today: Optional[date] = None,
 ) -> Dict[str, Any]:
+    today = today or date.today()
     ticker_result: Dict[str, Any] = {"ticker": ticker, "selected_expirations": [], "candidates": []}
 
     hist = market_provider.get_price_history(
@@ -117,10 +172,13 @@ def _process_ticker(
     technicals = compute_technicals(hist)
     ticker_result["technicals"] = technicals
     spot = float(technicals["spot"])
+    decision_logger = _decision_logger(options_provider, ticker)
+    want_put = "PUT" in strategies
+    want_call = "CALL" in strategies
 
     expirations = options_provider.get_options_expirations(ticker)
     max_dte = int(config.get("max_dte", 45))
-    selected_dates = select_expiration_dates(expirations, date.today(), max_dte)
+    selected_dates = select_expiration_dates(expirations, today, max_dte)
     ticker_result["selected_expirations"] = selected_dates
 
     earnings_date = fundamentals_provider.get_earnings_date(ticker)
@@ -152,11 +210,14 @@ def _process_ticker(
         cc_min_yield = float(_raw_min_yield)
         logger.info("%s: CC min yield filter = %.0f%%", ticker, cc_min_yield * 100)
 
+    max_chain_workers = int(config.get("max_chain_workers", 4))
+    chains = options_provider.get_options_chains(ticker, selected_dates, max_chain_workers)
+
     for expiry in selected_dates:
-        dte_days = get_dte(expiry, date.today())
+        dte_days = get_dte(expiry, today)
         bucket_name, bucket_label = get_term_for_dte(dte_days)
 
-        calls_df, puts_df = options_provider.get_options_chain(ticker, expiry)
+        calls_df, puts_df = chains[expiry]
 
         # Pre-filter the calls DataFrame before any per-row computation.
         if calls_df is not None and not calls_df.empty and "strike" in calls_df.columns:
@@ -180,9 +241,11 @@ def _process_ticker(
                 earnings_date=earnings_date,
                 config=config,
                 logger=logger,
-                decision_logger=lambda row: options_provider.log_option_screen_result(ticker, row),
+                decision_logger=decision_logger,
+                today=today,
+                dte=dte_days,
             )
-            if "PUT" in strategies
+            if want_put
             else []
         )
         call_candidates = (
@@ -198,9 +261,11 @@ def _process_ticker(
                 earnings_date=earnings_date,
                 config=config,
                 logger=logger,
-                decision_logger=lambda row: options_provider.log_option_screen_result(ticker, row),
+                decision_logger=decision_logger,
+                today=today,
+                dte=dte_days,
             )
-            if "CALL" in strategies
+            if want_call
             else []
         )
 
@@ -216,14 +281,10 @@ def _process_ticker(
                 logger.info("%s expiry=%s: dropped %d calls below %.0f%% yield",
                             ticker, expiry.isoformat(), dropped, cc_min_yield * 100)
 
-        all_expiry = put_candidates + call_candidates
-        for row in all_expiry:
-            score, why = score_candidate(row, technicals, config)
-            row["score"] = round(score, 4)
-            row["why_ranked_high"] = why
+        _score_rows(put_candidates + call_candidates, technicals, config)
 
-        top_puts = sorted(put_candidates, key=lambda x: x.get("score", 0.0), reverse=True)[:max_n]
-        top_calls = sorted(call_candidates, key=lambda x: x.get("score", 0.0), reverse=True)[:max_n]
+        top_puts = _top_n_by_score(put_candidates, max_n)
+        top_calls = _top_n_by_score(call_candidates, max_n)
 
         ticker_result["candidates"].extend(top_puts)
         ticker_result["candidates"].extend(top_calls)
@@ -241,14 +302,15 @@ def _process_ticker(
     # Stored separately so they don't pollute the short/medium/long detail tables.
     long_term_months = int(config.get("cc_recommendation", {}).get("long_term_months", 0))
     monthly_call_candidates: List[Dict[str, Any]] = []
-    if "CALL" in strategies and long_term_months > 0:
+    if want_call and long_term_months > 0:
         monthly_dates = select_monthly_cc_expiration_dates(
-            expirations, date.today(), max_dte, long_term_months
+            expirations, today, max_dte, long_term_months
         )
         logger.info("%s: monthly CC expirations (%d months): %s", ticker, long_term_months,
                     ", ".join(d.isoformat() for d in monthly_dates) or "none")
+        monthly_chains = options_provider.get_options_chains(ticker, monthly_dates, max_chain_workers)
         for expiry in monthly_dates:
-            calls_df, _ = options_provider.get_options_chain(ticker, expiry)
+            calls_df, _ = monthly_chains[expiry]
             if calls_df is not None and not calls_df.empty and "strike" in calls_df.columns:
                 strikes = calls_df["strike"].astype(float)
                 if cc_min_strike is not None:
@@ -269,23 +331,23 @@ def _process_ticker(
                 earnings_date=earnings_date,
                 config=config,
                 logger=logger,
-                decision_logger=lambda row: options_provider.log_option_screen_result(ticker, row),
+                decision_logger=decision_logger,
+                today=today,
             )
             if cc_min_yield is not None:
                 month_candidates = [
                     c for c in month_candidates
                     if (c.get("annualized_yield") or 0) >= cc_min_yield
                 ]
-            for row in month_candidates:
-                score, why = score_candidate(row, technicals, config)
-                row["score"] = round(score, 4)
-                row["why_ranked_high"] = why
+            _score_rows(month_candidates, technicals, config)
             monthly_call_candidates.extend(month_candidates)
             logger.info("%s monthly expiry=%s candidates=%d", ticker, expiry.isoformat(), len(month_candidates))
     ticker_result["monthly_call_candidates"] = monthly_call_candidates
 
-    # Attach ticker-level IVR (HV Rank) to every candidate for the detail table
-    ticker_ivr, ticker_ivr_source = compute_ivr_proxy(hist, None)
+    # Attach ticker-level IVR (HV Rank) to every candidate for the detail table.
+    # The HV range is kept so the CC/CSP recommenders do not recompute it.
+    ticker_result["hv_range"] = compute_hv_range(hist)
+    ticker_ivr, ticker_ivr_source = compute_ivr_proxy(hist, None, ticker_result["hv_range"])
     for c in ticker_result["candidates"]:
         c["ivr"] = ticker_ivr
         c["ivr_source"] = ticker_ivr_source
@@ -320,6 +382,11 @@ def validate_config(config: Dict[str, Any]) -> None:
     if max_dte < 7:
         raise ValueError(f"max_dte must be >= 7; got {max_dte}")
 
+    for key in ("max_workers", "max_chain_workers", "public_max_inflight_requests"):
+        workers = int(config.get(key, 1))
+        if workers < 1:
+            raise ValueError(f"{key} must be >= 1; got {workers}")
+
 
 def run_pipeline(config: Dict[str, Any], logger) -> None:
     validate_config(config)
@@ -334,11 +401,11 @@ def run_pipeline(config: Dict[str, Any], logger) -> None:
     cc_tickers: List[str] = [str(t).upper() for t in config.get("covered_call_tickers", [])]
     csp_tickers: List[str] = [str(t).upper() for t in config.get("cash_secured_put_tickers", [])]
 
-    ticker_strategies: Dict[str, List[str]] = {}
+    ticker_strategies: Dict[str, FrozenSet[str]] = {}
     for t in cc_tickers:
-        ticker_strategies.setdefault(t, []).append("CALL")
+        ticker_strategies[t] = ticker_strategies.get(t, frozenset()) | {"CALL"}
     for t in csp_tickers:
-        ticker_strategies.setdefault(t, []).append("PUT")
+        ticker_strategies[t] = ticker_strategies.get(t, frozenset()) | {"PUT"}
     all_tickers = list(ticker_strategies.keys())
 
     all_candidates: List[Dict[str, Any]] = []
@@ -346,11 +413,14 @@ def run_pipeline(config: Dict[str, Any], logger) -> None:
     expiration_summary: Dict[str, List[date]] = {}
     ticker_results_map: Dict[str, Dict[str, Any]] = {}
 
+    # One reference date for the whole run so every ticker sees the same DTEs.
+    today = date.today()
+
     profile = str(config.get("active_profile") or "").strip()
     profile_label = f"  Profile       : {profile}" if profile else ""
     print(
         f"\n{'=' * 52}\n"
-        f"  Options Screener  —  {date.today()}\n"
+        f"  Options Screener  —  {today}\n"
         + (f"{profile_label}\n" if profile_label else "")
         + f"  Covered Calls : {', '.join(cc_tickers) or '(none)'}\n"
         f"  Cash-Sec Puts : {', '.join(csp_tickers) or '(none)'}\n"
@@ -359,9 +429,24 @@ def run_pipeline(config: Dict[str, Any], logger) -> None:
     )
     logger.info("Starting options screener for tickers=%s", ",".join(all_tickers))
 
-    for ticker, strategies in ticker_strategies.items():
-        try:
-            result = _process_ticker(
+    # Providers with a batch history endpoint fetch every ticker's prices in one
+    # request up front; the per-ticker get_price_history calls then reuse them.
+    history_batch = getattr(market_provider, "get_price_history_batch", None)
+    if history_batch is not None and len(ticker_strategies) > 1:
+        history_batch(
+            list(ticker_strategies),
+            period=config["price_history_period"],
+            interval=config["price_history_interval"],
+        )
+
+    # Ticker processing is dominated by provider network I/O, so overlap the
+    # waits with a thread pool. Results are collected in ticker order to keep
+    # the report and console summary deterministic.
+    max_workers = min(int(config.get("max_workers", 8)), max(len(ticker_strategies), 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            ticker: executor.submit(
+                _process_ticker,
                 ticker,
                 options_provider=options_provider,
                 market_provider=market_provider,
@@ -369,21 +454,30 @@ def run_pipeline(config: Dict[str, Any], logger) -> None:
                 config=config,
                 logger=logger,
                 strategies=strategies,
+                today=today,
             )
-            expiration_summary[ticker] = result.get("selected_expirations", [])
-            all_candidates.extend(result.get("candidates", []))
-            all_monthly_call_candidates.extend(result.get("monthly_call_candidates", []))
-            ticker_results_map[ticker] = result
-        except Exception as exc:
-            logger.exception("Failed processing %s: %s", ticker, exc)
-            continue
+            for ticker, strategies in ticker_strategies.items()
+        }
+        for ticker, future in futures.items():
+            try:
+                result = future.result()
+                expiration_summary[ticker] = result.get("selected_expirations", [])
+                all_candidates.extend(result.get("candidates", []))
+                all_monthly_call_candidates.extend(result.get("monthly_call_candidates", []))
+                ticker_results_map[ticker] = result
+            except Exception as exc:
+                logger.exception("Failed processing %s: %s", ticker, exc)
+                continue
 
     cc_recommendations = build_cc_recommendations(ticker_results_map, cc_tickers, config)
     csp_recommendations = build_csp_recommendations(ticker_results_map, csp_tickers, config)
 
+    # Built once and shared by the report writer and the console summary.
+    df = candidates_frame(all_candidates)
+
     fallback_events = getattr(options_provider, "fallback_events", [])
     csv_path, html_path = write_reports(
-        all_candidates, config, DISCLAIMER,
+        df, config, DISCLAIMER,
         csp_recommendations=csp_recommendations,
         cc_recommendations=cc_recommendations,
         monthly_call_candidates=all_monthly_call_candidates,
@@ -403,19 +497,18 @@ def run_pipeline(config: Dict[str, Any], logger) -> None:
             dates_str = "none"
         print(f"  - {t}: {dates_str}")
 
-    df = pd.DataFrame(all_candidates)
     if not df.empty:
-        grouped = df.groupby(["ticker", "bucket", "strategy"]).size().reset_index(name="count")
+        grouped = df.groupby(["ticker", "bucket", "strategy"], sort=False).size()
         print("Candidate counts (post-filter, post-ranking):")
-        for _, row in grouped.iterrows():
-            print(f"  - {row['ticker']} {row['bucket']} {row['strategy']}: {int(row['count'])}")
-        top3 = df.sort_values("score", ascending=False).head(3)
+        for (ticker, bucket, strategy), count in grouped.items():
+            print(f"  - {ticker} {bucket} {strategy}: {int(count)}")
+        top3 = df.nlargest(3, "score")
         print("Top 3 highlights:")
-        for _, row in top3.iterrows():
+        for row in top3.itertuples(index=False):
             print(
-                f"  - {row['ticker']} {row['strategy']} {row['bucket_label']} "
-                f"strike={row['strike']:.2f} exp={row['expiration']} "
-                f"yield={row['annualized_yield']:.2%} score={row['score']:.3f}"
+                f"  - {row.ticker} {row.strategy} {row.bucket_label} "
+                f"strike={row.strike:.2f} exp={row.expiration} "
+                f"yield={row.annualized_yield:.2%} score={row.score:.3f}"
             )
     else:
         print("No candidates passed filters today.")
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -22,6 +23,22 @@ class OptionsChainProvider(ABC):
     def get_options_chain(self, ticker: str, expiration: date) -> Tuple[pd.DataFrame, pd.DataFrame]:
         raise NotImplementedError
 
+    def get_options_chains(
+        self, ticker: str, expirations: List[date], max_workers: int = 4
+    ) -> Dict[date, Tuple[pd.DataFrame, pd.DataFrame]]:
+        """Fetch chains for several expirations; the default overlaps per-expiry calls on threads.
+
+        A failed fetch re-raises. Providers with a batch endpoint may override.
+        """
+        if not expirations:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(expirations)))) as executor:
+            futures = {
+                expiry: executor.submit(self.get_options_chain, ticker, expiry)
+                for expiry in expirations
+            }
+            return {expiry: future.result() for expiry, future in futures.items()}
+
     def log_option_screen_result(self, ticker: str, row: dict) -> None:
         # Optional provider hook for row-level diagnostics.
         return None
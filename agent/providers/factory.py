@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import logging
 import os
 import sys
+import threading
 from datetime import date
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -16,14 +19,15 @@ _YELLOW = "\033[33m" if sys.stderr.isatty() else ""
 _BOLD   = "\033[1m"  if sys.stderr.isatty() else ""
 _RESET  = "\033[0m"  if sys.stderr.isatty() else ""
 _LINE   = "=" * 68
+_BANNER = f"\n{_YELLOW}{_BOLD}{_LINE}\n  WARNING: {{message}}\n{_LINE}{_RESET}\n\n"
 
 
 def _prominent_warning(logger, message: str) -> None:
     """Log at WARNING level AND print a visually distinct banner to stderr."""
     logger.warning(message)
-    print(f"\n{_YELLOW}{_BOLD}{_LINE}", file=sys.stderr)
-    print(f"  WARNING: {message}", file=sys.stderr)
-    print(f"{_LINE}{_RESET}\n", file=sys.stderr)
+    if logger.isEnabledFor(logging.WARNING):
+        sys.stderr.write(_BANNER.format(message=message))
+        sys.stderr.flush()
 
 
 def _provider_name(config: Dict[str, Any], key: str, default: str) -> str:
@@ -42,34 +46,48 @@ class _FallbackOptionsProvider(OptionsChainProvider):
         self._secondary = secondary
         self._logger = logger
         self.fallback_events: List[str] = []  # collected by pipeline for HTML report
+        # Public greeks keyed by normalized OSI symbol, shared across chains for the run.
+        self._greeks_cache: Dict[str, Dict[str, Optional[float]]] = {}
+        self._greeks_lock = threading.Lock()
 
     def _record_fallback(self, message: str) -> None:
         _prominent_warning(self._logger, message)
         self.fallback_events.append(message)
 
+    @staticmethod
+    def _normalize_osi_series(symbols: pd.Series) -> pd.Series:
+        """Vectorized PublicOptionsProvider._normalize_osi_symbol; missing symbols map to ''."""
+        return symbols.fillna("").astype(str).str.replace(" ", "", regex=False).str.strip().str.upper()
+
     def _enrich_delta_from_public(self, calls: pd.DataFrame, puts: pd.DataFrame) -> None:
-        """Best-effort: inject delta from Public greeks into yfinance chain DataFrames."""
-        symbols: List[str] = []
-        for df in [calls, puts]:
-            if not df.empty and "contractSymbol" in df.columns:
-                symbols.extend(
-                    self._primary._normalize_osi_symbol(s)
-                    for s in df["contractSymbol"].dropna()
-                )
+        """Best-effort: inject delta from Public greeks into yfinance chain DataFrames.
+
+        Greeks already fetched for an earlier chain are reused; only symbols
+        not yet in the cache are requested, in a single batched call.
+        """
+        # Normalize each frame's symbols once, vectorized; reused for the lookup below.
+        keyed = [
+            (df, self._normalize_osi_series(df["contractSymbol"]))
+            for df in [calls, puts]
+            if not df.empty and "contractSymbol" in df.columns
+        ]
+        symbols = [s for _, keys in keyed for s in keys.unique() if s]
         if not symbols:
             return
         try:
-            greeks = self._primary._get_greeks(symbols)
+            with self._greeks_lock:
+                missing = [s for s in dict.fromkeys(symbols) if s not in self._greeks_cache]
+            if missing:
+                fetched = self._primary._get_greeks(missing)
+                with self._greeks_lock:
+                    for s in missing:
+                        self._greeks_cache[s] = fetched.get(s) or {}
+            greeks = {s: self._greeks_cache[s] for s in symbols if self._greeks_cache.get(s)}
             if not greeks:
                 return
-            for df in [calls, puts]:
-                if df.empty or "contractSymbol" not in df.columns:
-                    continue
-                delta_vals = [
-                    (greeks.get(self._primary._normalize_osi_symbol(s)) or {}).get("delta")
-                    for s in df["contractSymbol"]
-                ]
-                df["delta"] = delta_vals
+            deltas = {s: g.get("delta") for s, g in greeks.items()}
+            for df, keys in keyed:
+                df["delta"] = keys.map(deltas)
             self._logger.info("Delta enriched from Public greeks for %d symbol(s)", len(greeks))
         except Exception as exc:
             self._logger.debug("Public delta enrichment failed (best-effort): %s", exc)
@@ -100,40 +118,93 @@ class _FallbackOptionsProvider(OptionsChainProvider):
             return calls, puts
         return calls, puts
 
+    def get_options_chains(
+        self, ticker: str, expirations: List[date], max_workers: int = 4
+    ) -> Dict[date, Tuple[pd.DataFrame, pd.DataFrame]]:
+        try:
+            chains = self._primary.get_options_chains(ticker, expirations, max_workers)
+        except Exception as exc:
+            self._record_fallback(f"{ticker}: Public provider error fetching chains ({exc}) — using yfinance")
+            chains = {}
+        missing: List[date] = []
+        for expiry in expirations:
+            calls, puts = chains.get(expiry, (pd.DataFrame(), pd.DataFrame()))
+            if calls.empty and puts.empty:
+                if chains:
+                    self._record_fallback(f"{ticker} {expiry.isoformat()}: Public provider returned empty chain — using yfinance")
+                missing.append(expiry)
+        if missing:
+            for expiry, (calls, puts) in self._secondary.get_options_chains(ticker, missing, max_workers).items():
+                self._enrich_delta_from_public(calls, puts)
+                chains[expiry] = (calls, puts)
+        return {expiry: chains[expiry] for expiry in expirations}
+
     def log_option_screen_result(self, ticker: str, row: dict) -> None:
         self._primary.log_option_screen_result(ticker, row)
 
 
+def _yfinance_provider(config: Dict[str, Any], logger) -> YFinanceProvider:
+    return _shared_yfinance_provider(
+        logger,
+        str(config["log_dir"]),
+        config.get("cache_dir"),
+        float(config.get("cache_ttl_minutes") or 0),
+    )
+
+
+@lru_cache(maxsize=None)
+def _shared_yfinance_provider(
+    logger, log_dir: str, cache_dir: Optional[str], cache_ttl_minutes: float
+) -> YFinanceProvider:
+    # The options, market and fundamentals builders share one instance per
+    # configuration so its yf.Ticker objects and CSV schema checks are reused.
+    return YFinanceProvider(
+        logger=logger,
+        log_dir=log_dir,
+        cache_dir=cache_dir,
+        cache_ttl_minutes=cache_ttl_minutes,
+    )
+
+
+def _public_options_provider(config: Dict[str, Any], logger) -> OptionsChainProvider:
+    secret_env_var = str(config.get("public_api_key_env_var", "PUBLIC_API_KEY"))
+    yf_provider = _yfinance_provider(config, logger)
+    if not os.environ.get(secret_env_var):
+        _prominent_warning(
+            logger,
+            f"options_data_provider=public but env var '{secret_env_var}' is not set — falling back to yfinance",
+        )
+        return yf_provider
+    public_provider = PublicOptionsProvider(logger=logger, config=config, log_dir=str(config["log_dir"]))
+    return _FallbackOptionsProvider(primary=public_provider, secondary=yf_provider, logger=logger)
+
+
+_ProviderBuilder = Callable[[Dict[str, Any], Any], Any]
+
+# Provider name -> builder, per config key. Dict order sets the "Expected one of" hint.
+_REGISTRY: Dict[str, Dict[str, _ProviderBuilder]] = {
+    "options_data_provider": {"yfinance": _yfinance_provider, "public": _public_options_provider},
+    "market_data_provider": {"yfinance": _yfinance_provider},
+    "fundamentals_provider": {"yfinance": _yfinance_provider},
+}
+
+
+def _build(key: str, config: Dict[str, Any], logger) -> Any:
+    builders = _REGISTRY[key]
+    name = _provider_name(config, key, "yfinance")
+    builder = builders.get(name)
+    if builder is None:
+        raise ValueError(f"Unsupported {key}='{name}'. Expected one of: {', '.join(builders)}")
+    return builder(config, logger)
+
+
 def build_options_provider(config: Dict[str, Any], logger) -> OptionsChainProvider:
-    name = _provider_name(config, "options_data_provider", "yfinance")
-    log_dir = str(config["log_dir"])
-    if name == "yfinance":
-        return YFinanceProvider(logger=logger, log_dir=log_dir)
-    if name == "public":
-        secret_env_var = str(config.get("public_api_key_env_var", "PUBLIC_API_KEY"))
-        yf_provider = YFinanceProvider(logger=logger, log_dir=log_dir)
-        if not os.environ.get(secret_env_var):
-            _prominent_warning(
-                logger,
-                f"options_data_provider=public but env var '{secret_env_var}' is not set — falling back to yfinance",
-            )
-            return yf_provider
-        public_provider = PublicOptionsProvider(logger=logger, config=config, log_dir=log_dir)
-        return _FallbackOptionsProvider(primary=public_provider, secondary=yf_provider, logger=logger)
-    raise ValueError(f"Unsupported options_data_provider='{name}'. Expected one of: yfinance, public")
+    return _build("options_data_provider", config, logger)
 
 
 def build_market_provider(config: Dict[str, Any], logger) -> MarketDataProvider:
-    name = _provider_name(config, "market_data_provider", "yfinance")
-    log_dir = str(config["log_dir"])
-    if name == "yfinance":
-        return YFinanceProvider(logger=logger, log_dir=log_dir)
-    raise ValueError(f"Unsupported market_data_provider='{name}'. Expected one of: yfinance")
+    return _build("market_data_provider", config, logger)
 
 
 def build_fundamentals_provider(config: Dict[str, Any], logger) -> FundamentalsProvider:
-    name = _provider_name(config, "fundamentals_provider", "yfinance")
-    log_dir = str(config["log_dir"])
-    if name == "yfinance":
-        return YFinanceProvider(logger=logger, log_dir=log_dir)
-    raise ValueError(f"Unsupported fundamentals_provider='{name}'. Expected one of: yfinance")
+    return _build("fundamentals_provider", config, logger)
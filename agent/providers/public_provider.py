@@ -1,14 +1,101 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 from agent.providers.base import OptionsChainProvider
 
+try:  # optional: faster JSON decoding for large chain/greeks payloads
+    import orjson
+except ImportError:
+    orjson = None
+
+# Option chain frame columns, in output order; the float ones are built as float64 arrays.
+_CHAIN_COLUMNS = (
+    "contractSymbol",
+    "strategy",
+    "strike",
+    "bid",
+    "ask",
+    "lastPrice",
+    "volume",
+    "openInterest",
+    "impliedVolatility",
+    "delta",
+)
+_FLOAT_CHAIN_COLUMNS = frozenset(
+    {"strike", "bid", "ask", "lastPrice", "volume", "openInterest", "impliedVolatility", "delta"}
+)
+
+_VALID_STRATEGIES = frozenset(("PUT", "CALL"))
+
+
+def _upper(value: Any) -> str:
+    """str(value or "").upper(), skipping the conversion for empty values."""
+    if not value:
+        return ""
+    return value.upper() if isinstance(value, str) else str(value).upper()
+
+
+# OSI tail: YYMMDD expiry, C/P, strike x1000 in 8 digits (the root before it is not needed).
+_OSI_RE = re.compile(r"(\d{6})([CP])(\d{8})$")
+
+
+@lru_cache(maxsize=1024)
+def _osi_date(yymmdd: str) -> Optional[date]:
+    """OSI YYMMDD -> date (20YY), or None for an impossible date; a chain shares a few expiries."""
+    try:
+        return date(2000 + int(yymmdd[:2]), int(yymmdd[2:4]), int(yymmdd[4:]))
+    except ValueError:
+        return None
+
+
+def _first(d: Dict[str, Any], *keys: str) -> Any:
+    """Value of the first key in d that is present and not None."""
+    for key in keys:
+        value = d.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(value: str) -> Optional[date]:
+    """date.fromisoformat, memoized: a chain repeats the same expiration string on every row."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _direct_metric_keys(metric: str) -> Tuple[str, ...]:
+    return (metric, metric.capitalize(), f"{metric}Value", f"option{metric.capitalize()}")
+
+
+# Field-name variants probed by _extract_metric, built once rather than per row.
+_DIRECT_METRIC_KEYS: Dict[str, Tuple[str, ...]] = {
+    metric: _direct_metric_keys(metric) for metric in ("delta", "impliedVolatility")
+}
+_NESTED_GREEK_CONTAINERS = ("greeks", "greek", "optionGreeks", "greekValues", "values", "payload")
+_GREEK_NAME_KEYS = ("name", "type", "greek", "greekType")
+_GREEK_VALUE_KEYS = ("value", "greekValue", "val")
+
 
 class PublicOptionsProvider(OptionsChainProvider):
     """Public.com options provider using market-data + greeks endpoints."""
@@ -21,12 +108,48 @@ class PublicOptionsProvider(OptionsChainProvider):
         self.timeout_seconds = float(config.get("public_http_timeout_seconds", 20))
         self.secret_env_var = str(config.get("public_api_key_env_var", "PUBLIC_API_KEY"))
         self.token_validity_minutes = int(config.get("public_access_token_validity_minutes", 15))
+        self.token_refresh_skew_seconds = float(config.get("public_token_refresh_skew_seconds", 30))
+        # Access token persisted between runs (owner-only permissions).
+        self._token_path = Path(log_dir) / ".public_token.json"
         self.instrument_type = str(
             config.get("public_underlying_instrument_type", config.get("public_instrument_type", "EQUITY"))
         )
         self._access_token: Optional[str] = None
         self._access_token_expires_at: Optional[datetime] = None
+        self._cached_headers: Optional[Dict[str, str]] = None
+        self._cached_headers_token: Optional[str] = None
+        self._greek_container_hint: Optional[str] = None
         self._account_id: Optional[str] = str(config.get("public_account_id") or "").strip() or None
+        # Upper bound on Public HTTP calls in flight across all ticker/chain/greeks threads.
+        self.max_inflight_requests = max(1, int(config.get("public_max_inflight_requests", 16)))
+        self._inflight = threading.BoundedSemaphore(self.max_inflight_requests)
+        self._session = self._build_session(pool_maxsize=max(32, self.max_inflight_requests))
+        # Guards token refresh and account lookup when chains/greeks are fetched on threads.
+        self._auth_lock = threading.RLock()
+
+    @staticmethod
+    def _build_session(pool_maxsize: int = 32) -> requests.Session:
+        """Pooled keep-alive session; transient gateway/rate-limit errors are retried with back-off."""
+        session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 502, 503, 504),
+            raise_on_status=False,
+        )
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry))
+        # gzip/deflate always; br/zstd too when urllib3 can decode them (brotli/zstandard installed).
+        session.headers.update({"Accept": "application/json", "Accept-Encoding": ACCEPT_ENCODING})
+        return session
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> "PublicOptionsProvider":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     @staticmethod
     def _normalize_osi_symbol(symbol: Any) -> str:
@@ -36,24 +159,39 @@ class PublicOptionsProvider(OptionsChainProvider):
     def _parse_osi(symbol: str) -> Dict[str, Any]:
         s = str(symbol or "").strip()
         out: Dict[str, Any] = {"contract_symbol": s, "strategy": None, "strike": None, "expiration": None}
-        if len(s) < 15:
-            return out
-        tail = s[-15:]
-        date_part = tail[:6]
-        cp = tail[6:7]
-        strike_part = tail[7:]
-        if cp not in {"C", "P"}:
+        m = _OSI_RE.search(s)
+        if m is None:
             return out
-        try:
-            parsed_exp = datetime.strptime(date_part, "%y%m%d").date()
-            parsed_strike = int(strike_part) / 1000.0
-        except ValueError:
+        parsed_exp = _osi_date(m.group(1))
+        if parsed_exp is None:
             return out
-        out["strategy"] = "CALL" if cp == "C" else "PUT"
-        out["strike"] = parsed_strike
+        out["strategy"] = "CALL" if m.group(2) == "C" else "PUT"
+        out["strike"] = int(m.group(3)) / 1000.0
         out["expiration"] = parsed_exp
         return out
 
+    @staticmethod
+    def _parse_osi_many(
+        symbols: List[str],
+    ) -> Tuple[List[Optional[str]], List[Optional[float]], List[Optional[date]]]:
+        """_parse_osi over many symbols: (strategies, strikes, expirations), None where a symbol does not parse."""
+        strategies: List[Optional[str]] = []
+        strikes: List[Optional[float]] = []
+        expirations: List[Optional[date]] = []
+        search = _OSI_RE.search
+        for symbol in symbols:
+            m = search(str(symbol or "").rstrip())
+            parsed_exp = _osi_date(m.group(1)) if m is not None else None
+            if parsed_exp is None:
+                strategies.append(None)
+                strikes.append(None)
+                expirations.append(None)
+                continue
+            strategies.append("CALL" if m.group(2) == "C" else "PUT")
+            strikes.append(int(m.group(3)) / 1000.0)
+            expirations.append(parsed_exp)
+        return strategies, strikes, expirations
+
     @staticmethod
     def _as_float(value: Any) -> Optional[float]:
         try:
@@ -73,59 +211,78 @@ class PublicOptionsProvider(OptionsChainProvider):
             return None
 
     @staticmethod
-    def _chunks(items: List[str], size: int) -> List[List[str]]:
-        return [items[i : i + size] for i in range(0, len(items), size)]
+    def _iter_chunks(items: List[str], size: int) -> Iterator[List[str]]:
+        for i in range(0, len(items), size):
+            yield items[i : i + size]
 
     @staticmethod
-    def _get_ci(d: Any, key: str) -> Any:
+    def _ci_index(d: Any) -> Dict[str, Any]:
+        """Lower-cased key -> value map for case-insensitive lookups (first key wins); {} for non-dicts."""
         if not isinstance(d, dict):
-            return None
+            return {}
+        idx: Dict[str, Any] = {}
+        for k, v in d.items():
+            idx.setdefault(str(k).lower(), v)
+        return idx
+
+    @staticmethod
+    def _ci_lookup(d: Dict[str, Any], idx: Dict[str, Any], key: str) -> Any:
+        """Case-insensitive d[key]: exact key first, then the prebuilt _ci_index of d."""
         if key in d:
             return d[key]
-        key_l = key.lower()
-        for k, v in d.items():
-            if str(k).lower() == key_l:
-                return v
-        return None
+        return idx.get(key.lower())
+
+    def _extract_metric(
+        self, row: Dict[str, Any], metric: str, row_index: Optional[Dict[str, Any]] = None
+    ) -> Optional[float]:
+        # row must be a dict (rows are filtered once per response). Callers extracting several
+        # metrics from one row pass its _ci_index to avoid rebuilding it.
+        if row_index is None:
+            row_index = self._ci_index(row)
 
-    def _extract_metric(self, row: Dict[str, Any], metric: str) -> Optional[float]:
         # Direct field variants
-        direct_keys = [metric, metric.capitalize(), f"{metric}Value", f"option{metric.capitalize()}"]
+        direct_keys = _DIRECT_METRIC_KEYS.get(metric) or _direct_metric_keys(metric)
         for k in direct_keys:
-            v = self._get_ci(row, k)
+            v = self._ci_lookup(row, row_index, k)
             fv = self._as_float(v)
             if fv is not None:
                 return fv
 
         # Nested dict variants
-        nested_containers = ["greeks", "greek", "optionGreeks", "greekValues", "values", "payload"]
-        for container_key in nested_containers:
-            container = self._get_ci(row, container_key)
+        # Try the container that matched last time first: responses use one shape throughout.
+        metric_l = metric.lower()
+        hint = self._greek_container_hint
+        containers = _NESTED_GREEK_CONTAINERS
+        if hint is not None and hint != containers[0]:
+            containers = (hint, *(c for c in containers if c != hint))
+        for container_key in containers:
+            container = self._ci_lookup(row, row_index, container_key)
+            if container is None:
+                continue
             if isinstance(container, dict):
-                v = self._get_ci(container, metric)
+                v = self._ci_lookup(container, self._ci_index(container), metric)
                 fv = self._as_float(v)
                 if fv is not None:
+                    self._greek_container_hint = container_key
                     return fv
             if isinstance(container, list):
                 for item in container:
                     if not isinstance(item, dict):
                         continue
-                    greek_name = (
-                        self._get_ci(item, "name")
-                        or self._get_ci(item, "type")
-                        or self._get_ci(item, "greek")
-                        or self._get_ci(item, "greekType")
+                    item_index = self._ci_index(item)
+                    greek_name = next(
+                        (n for n in (self._ci_lookup(item, item_index, k) for k in _GREEK_NAME_KEYS) if n),
+                        None,
                     )
-                    if str(greek_name or "").strip().lower() != metric.lower():
+                    if str(greek_name or "").strip().lower() != metric_l:
                         continue
-                    v = (
-                        self._get_ci(item, "value")
-                        or self._get_ci(item, "greekValue")
-                        or self._get_ci(item, "val")
-                        or self._get_ci(item, metric)
-                    )
+                    v = next(
+                        (x for x in (self._ci_lookup(item, item_index, k) for k in _GREEK_VALUE_KEYS) if x),
+                        None,
+                    ) or self._ci_lookup(item, item_index, metric)
                     fv = self._as_float(v)
                     if fv is not None:
+                        self._greek_container_hint = container_key
                         return fv
         return None
 
@@ -139,14 +296,15 @@ class PublicOptionsProvider(OptionsChainProvider):
         payload: Optional[Dict[str, Any]] = None,
     ) -> Any:
         url = f"{self.base_url}{path}"
-        resp = requests.request(
-            method=method,
-            url=url,
-            headers=headers,
-            params=params,
-            json=payload,
-            timeout=self.timeout_seconds,
-        )
+        with self._inflight:
+            resp = self._session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                json=payload,
+                timeout=self.timeout_seconds,
+            )
         if resp.status_code >= 400:
             self.logger.error(
                 "Public API request failed method=%s path=%s status=%s params=%s payload=%s response=%s",
@@ -158,6 +316,20 @@ class PublicOptionsProvider(OptionsChainProvider):
                 (resp.text or "")[:1000],
             )
         resp.raise_for_status()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Public API %s %s encoding=%s wire_bytes=%s body_bytes=%d",
+                method,
+                path,
+                resp.headers.get("Content-Encoding", "identity"),
+                resp.headers.get("Content-Length", "?"),
+                len(resp.content),
+            )
+        if orjson is not None:
+            try:
+                return orjson.loads(resp.content)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN literals, which orjson rejects; let the stdlib decoder decide
         return resp.json()
 
     def _get_secret(self) -> str:
@@ -169,51 +341,102 @@ class PublicOptionsProvider(OptionsChainProvider):
         return secret
 
     def _get_access_token(self) -> str:
-        now = datetime.now(timezone.utc)
-        if (
-            self._access_token
-            and self._access_token_expires_at is not None
-            and now < self._access_token_expires_at
-        ):
-            return self._access_token
-
-        body = {"secret": self._get_secret(), "validityInMinutes": self.token_validity_minutes}
-        data = self._request_json("POST", "/userapiauthservice/personal/access-tokens", payload=body)
-        token = str((data or {}).get("accessToken") or "").strip()
-        if not token:
-            raise RuntimeError("Public API token response did not include accessToken")
-        ttl = max(self.token_validity_minutes - 1, 1)
+        with self._auth_lock:
+            now = datetime.now(timezone.utc)
+            if (
+                self._access_token
+                and self._access_token_expires_at is not None
+                and now < self._access_token_expires_at
+            ):
+                return self._access_token
+
+            secret = self._get_secret()
+            if self._access_token is None and self._load_persisted_token(secret, now):
+                return self._access_token
+
+            body = {"secret": secret, "validityInMinutes": self.token_validity_minutes}
+            data = self._request_json("POST", "/userapiauthservice/personal/access-tokens", payload=body)
+            token = str((data or {}).get("accessToken") or "").strip()
+            if not token:
+                raise RuntimeError("Public API token response did not include accessToken")
+            expires_at = now + timedelta(minutes=self.token_validity_minutes)
+            self._access_token = token
+            self._access_token_expires_at = expires_at - timedelta(seconds=self.token_refresh_skew_seconds)
+            self._persist_token(secret, token, expires_at)
+            return token
+
+    def _token_owner(self, secret: str) -> str:
+        # Ties a persisted token to the API host and secret it was issued for.
+        return hashlib.sha256(f"{self.base_url}|{secret}".encode("utf-8")).hexdigest()
+
+    def _load_persisted_token(self, secret: str, now: datetime) -> bool:
+        try:
+            with self._token_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("owner") != self._token_owner(secret):
+                return False
+            token = str(data.get("token") or "").strip()
+            refresh_at = datetime.fromisoformat(data["expires_at"]) - timedelta(
+                seconds=self.token_refresh_skew_seconds
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return False
+        if not token or now >= refresh_at:
+            return False
         self._access_token = token
-        self._access_token_expires_at = now + timedelta(minutes=ttl)
-        return token
+        self._access_token_expires_at = refresh_at
+        return True
+
+    def _persist_token(self, secret: str, token: str, expires_at: datetime) -> None:
+        tmp_path = self._token_path.with_name(f"{self._token_path.name}.{os.getpid()}.tmp")
+        try:
+            self._token_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"owner": self._token_owner(secret), "token": token, "expires_at": expires_at.isoformat()},
+                    f,
+                )
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self._token_path)
+        except OSError as exc:
+            self.logger.debug("Could not persist Public access token: %s", exc)
 
     def _auth_headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._get_access_token()}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        # Rebuilt only when the token rotates; callers must treat the dict as read-only.
+        token = self._get_access_token()
+        headers = self._cached_headers
+        if headers is None or self._cached_headers_token != token:
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
+            self._cached_headers = headers
+            self._cached_headers_token = token
+        return headers
 
     def _get_account_id(self) -> str:
-        if self._account_id:
-            return self._account_id
+        with self._auth_lock:
+            if self._account_id:
+                return self._account_id
 
-        data = self._request_json("GET", "/userapigateway/trading/account", headers=self._auth_headers())
-        if isinstance(data, dict):
-            accounts = data.get("accounts") or []
-        elif isinstance(data, list):
-            accounts = data
-        else:
-            accounts = []
-        if not accounts:
-            raise RuntimeError("Public API returned no accounts")
-        brokerage = [a for a in accounts if str(a.get("accountType", "")).upper() == "BROKERAGE"]
-        selected = brokerage[0] if brokerage else accounts[0]
-        account_id = str(selected.get("accountId") or "").strip()
-        if not account_id:
-            raise RuntimeError("Public API account payload missing accountId")
-        self._account_id = account_id
-        return account_id
+            data = self._request_json("GET", "/userapigateway/trading/account", headers=self._auth_headers())
+            if isinstance(data, dict):
+                accounts = data.get("accounts") or []
+            elif isinstance(data, list):
+                accounts = data
+            else:
+                accounts = []
+            if not accounts:
+                raise RuntimeError("Public API returned no accounts")
+            brokerage = [a for a in accounts if str(a.get("accountType", "")).upper() == "BROKERAGE"]
+            selected = brokerage[0] if brokerage else accounts[0]
+            account_id = str(selected.get("accountId") or "").strip()
+            if not account_id:
+                raise RuntimeError("Public API account payload missing accountId")
+            self._account_id = account_id
+            return account_id
 
     def _marketdata_post(self, endpoint: str, payload: Dict[str, Any]) -> Any:
         account_id = self._get_account_id()
@@ -223,60 +446,75 @@ class PublicOptionsProvider(OptionsChainProvider):
     def _get_greeks(self, osi_symbols: List[str]) -> Dict[str, Dict[str, Optional[float]]]:
         if not osi_symbols:
             return {}
+        chunk_size = 250
+        path = f"/userapigateway/option-details/{self._get_account_id()}/greeks"
+        if len(osi_symbols) <= chunk_size:
+            return self._fetch_greeks_chunk(path, osi_symbols)
+        # Chunks are independent GETs against the same host; overlap them on the pooled session.
+        n_chunks = -(-len(osi_symbols) // chunk_size)
         out: Dict[str, Dict[str, Optional[float]]] = {}
-        account_id = self._get_account_id()
-        path = f"/userapigateway/option-details/{account_id}/greeks"
-        for chunk in self._chunks(osi_symbols, 250):
-            data = self._request_json(
-                "GET",
-                path,
-                headers=self._auth_headers(),
-                params={"osiSymbols": ",".join(chunk)},
-            )
-            if isinstance(data, list):
-                rows = data
-            elif isinstance(data, dict):
-                payload = data.get("payload")
-                if isinstance(payload, list):
-                    rows = payload
-                elif isinstance(payload, dict):
-                    rows = (
-                        payload.get("greeks")
-                        or payload.get("optionGreeks")
-                        or payload.get("data")
-                        or []
-                    )
-                else:
-                    rows = (
-                        data.get("greeks")
-                        or data.get("optionGreeks")
-                        or data.get("data")
-                        or []
-                    )
+        with ThreadPoolExecutor(max_workers=min(8, n_chunks)) as executor:
+            chunks = self._iter_chunks(osi_symbols, chunk_size)
+            for part in executor.map(lambda chunk: self._fetch_greeks_chunk(path, chunk), chunks):
+                out.update(part)
+        return out
+
+    def _fetch_greeks_chunk(self, path: str, chunk: List[str]) -> Dict[str, Dict[str, Optional[float]]]:
+        out: Dict[str, Dict[str, Optional[float]]] = {}
+        data = self._request_json(
+            "GET",
+            path,
+            headers=self._auth_headers(),
+            params={"osiSymbols": ",".join(chunk)},
+        )
+        if isinstance(data, list):
+            rows = data
+        elif isinstance(data, dict):
+            payload = data.get("payload")
+            if isinstance(payload, list):
+                rows = payload
+            elif isinstance(payload, dict):
+                rows = (
+                    payload.get("greeks")
+                    or payload.get("optionGreeks")
+                    or payload.get("data")
+                    or []
+                )
             else:
-                rows = []
-            for row in rows:
-                instrument = row.get("instrument") if isinstance(row, dict) else {}
-                sym = self._normalize_osi_symbol(
-                    row.get("osiSymbol")
-                    or row.get("osi")
-                    or row.get("symbol")
-                    or row.get("optionSymbol")
-                    or (instrument.get("symbol") if isinstance(instrument, dict) else None)
+                rows = (
+                    data.get("greeks")
+                    or data.get("optionGreeks")
+                    or data.get("data")
+                    or []
                 )
-                if not sym:
-                    continue
-                out[sym] = {
-                    "delta": self._extract_metric(row, "delta"),
-                    "impliedVolatility": self._extract_metric(row, "impliedVolatility"),
-                }
-            matched_with_delta = sum(1 for v in out.values() if v.get("delta") is not None)
-            self.logger.debug(
-                "public greeks lookup requested=%d returned=%d matched_with_delta=%d",
-                len(chunk),
-                len(rows),
-                matched_with_delta,
+        else:
+            rows = []
+        returned = len(rows)
+        # Validate row shape once; everything below can assume dicts.
+        rows = [row for row in rows if isinstance(row, dict)]
+        for row in rows:
+            instrument = row.get("instrument")
+            sym = self._normalize_osi_symbol(
+                row.get("osiSymbol")
+                or row.get("osi")
+                or row.get("symbol")
+                or row.get("optionSymbol")
+                or (instrument.get("symbol") if isinstance(instrument, dict) else None)
             )
+            if not sym:
+                continue
+            row_index = self._ci_index(row)
+            out[sym] = {
+                "delta": self._extract_metric(row, "delta", row_index),
+                "impliedVolatility": self._extract_metric(row, "impliedVolatility", row_index),
+            }
+        matched_with_delta = sum(1 for v in out.values() if v.get("delta") is not None)
+        self.logger.debug(
+            "public greeks lookup requested=%d returned=%d matched_with_delta=%d",
+            len(chunk),
+            returned,
+            matched_with_delta,
+        )
         return out
 
     def _fetch_options_expirations(self, ticker: str) -> List[date]:
@@ -296,10 +534,9 @@ class PublicOptionsProvider(OptionsChainProvider):
                 raw = row.get("expirationDate") or row.get("expiration")
             if not raw:
                 continue
-            try:
-                expirations.append(date.fromisoformat(str(raw)))
-            except ValueError:
-                continue
+            parsed = _parse_iso_date(str(raw))
+            if parsed is not None:
+                expirations.append(parsed)
         return sorted(set(expirations))
 
     def smoke_test(self, ticker: str) -> Dict[str, Any]:
@@ -324,96 +561,160 @@ class PublicOptionsProvider(OptionsChainProvider):
             self.logger.warning("%s: public expirations lookup failed: %s", ticker, exc)
             return []
 
-    def get_options_chain(self, ticker: str, expiration: date) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        try:
-            payload = {
-                "instrument": {"symbol": ticker, "type": self.instrument_type},
-                "expirationDate": expiration.isoformat(),
-            }
-            data = self._marketdata_post("option-chain", payload)
-            if isinstance(data, dict):
-                calls_payload = data.get("calls") or []
-                puts_payload = data.get("puts") or []
-                rows = [*calls_payload, *puts_payload]
-            elif isinstance(data, list):
-                rows = data
-            else:
-                rows = []
-            options: List[Dict[str, Any]] = []
-            for row in rows:
-                instrument = row.get("instrument") or {}
-                symbol = str(
-                    row.get("symbol")
-                    or row.get("osiSymbol")
-                    or instrument.get("symbol")
-                    or ""
-                ).strip()
-                parsed = self._parse_osi(symbol)
-                symbol_key = self._normalize_osi_symbol(symbol)
-                row_exp = row.get("expirationDate") or row.get("expiration")
-                parsed_exp = parsed.get("expiration")
-                if row_exp:
-                    try:
-                        parsed_exp = date.fromisoformat(str(row_exp))
-                    except ValueError:
-                        pass
+    def _fetch_chain_options(self, ticker: str, expiration: date) -> Dict[str, Dict[str, List[Any]]]:
+        """Fetch one expiration's contracts as parallel column lists (see _CHAIN_COLUMNS), keyed by CALL/PUT."""
+        payload = {
+            "instrument": {"symbol": ticker, "type": self.instrument_type},
+            "expirationDate": expiration.isoformat(),
+        }
+        data = self._marketdata_post("option-chain", payload)
+        if isinstance(data, dict):
+            calls_payload = data.get("calls") or []
+            puts_payload = data.get("puts") or []
+            rows = [*calls_payload, *puts_payload]
+        elif isinstance(data, list):
+            rows = data
+        else:
+            rows = []
+        rows = [row for row in rows if isinstance(row, dict)]
+        # Contracts are classified into their side as they are parsed, so no re-filter pass is needed.
+        sides: Dict[str, Dict[str, List[Any]]] = {
+            side: {name: [] for name in (*_CHAIN_COLUMNS, "_contractSymbolKey")} for side in ("CALL", "PUT")
+        }
+        symbols = [
+            str(
+                row.get("symbol")
+                or row.get("osiSymbol")
+                or (row.get("instrument") or {}).get("symbol")
+                or ""
+            ).strip()
+            for row in rows
+        ]
+        # Rows for another expiration are dropped before any field extraction. Explicit row
+        # fields win; the OSI symbol is parsed only for kept rows missing one of them.
+        exp_iso = expiration.isoformat()
+        # Kept rows' parsed fields are held column-wise, like the chain itself, not as per-row objects.
+        kept_rows: List[Dict[str, Any]] = []
+        kept_symbols: List[str] = []
+        exps: List[Optional[date]] = []
+        strategies: List[Optional[str]] = []
+        strikes: List[Optional[float]] = []
+        needs_osi: List[int] = []
+        for row, symbol in zip(rows, symbols):
+            row_exp = row.get("expirationDate") or row.get("expiration")
+            parsed_exp = None
+            if row_exp:
+                row_exp = str(row_exp)
+                parsed_exp = expiration if row_exp == exp_iso else _parse_iso_date(row_exp)
                 if parsed_exp is not None and parsed_exp != expiration:
                     continue
+            strategy: Optional[str] = _upper(row.get("optionType") or row.get("type"))
+            if strategy not in _VALID_STRATEGIES:
+                put_or_call = row.get("putOrCall") or (row.get("instrument") or {}).get("putOrCall")
+                strategy = _upper(put_or_call) if put_or_call else None
+            strike = self._as_float(row.get("strikePrice"))
+            if strike is None:
+                strike = self._as_float(row.get("strike"))
+            if parsed_exp is None or strategy is None or strike is None:
+                needs_osi.append(len(kept_rows))
+            kept_rows.append(row)
+            kept_symbols.append(symbol)
+            exps.append(parsed_exp)
+            strategies.append(strategy)
+            strikes.append(strike)
+        if needs_osi:
+            osi_fields = zip(*self._parse_osi_many([kept_symbols[i] for i in needs_osi]))
+            for i, (osi_strategy, osi_strike, osi_exp) in zip(needs_osi, osi_fields):
+                if exps[i] is None:
+                    exps[i] = osi_exp
+                if strategies[i] is None:
+                    strategies[i] = _upper(osi_strategy)
+                if strikes[i] is None:
+                    strikes[i] = osi_strike
 
-                strategy = str(row.get("optionType") or row.get("type") or "").upper()
-                if strategy not in {"PUT", "CALL"}:
-                    strategy = str(
-                        row.get("putOrCall")
-                        or instrument.get("putOrCall")
-                        or parsed.get("strategy")
-                        or ""
-                    ).upper()
-                strike = self._as_float(row.get("strikePrice"))
-                if strike is None:
-                    strike = self._as_float(row.get("strike"))
-                if strike is None:
-                    strike = self._as_float(parsed.get("strike"))
-                options.append(
-                    {
-                        "contractSymbol": symbol,
-                        "_contractSymbolKey": symbol_key,
-                        "strategy": strategy,
-                        "strike": strike,
-                        "bid": self._as_float(row.get("bid") if row.get("bid") is not None else row.get("bidPrice")),
-                        "ask": self._as_float(row.get("ask") if row.get("ask") is not None else row.get("askPrice")),
-                        "lastPrice": self._as_float(
-                            row.get("last")
-                            if row.get("last") is not None
-                            else row.get("lastPrice")
-                        ),
-                        "volume": self._as_int(row.get("volume")),
-                        "openInterest": self._as_int(
-                            row.get("openInterest")
-                            if row.get("openInterest") is not None
-                            else row.get("open_interest")
-                        ),
-                        "impliedVolatility": self._as_float(
-                            row.get("impliedVolatility")
-                            if row.get("impliedVolatility") is not None
-                            else row.get("iv")
-                        ),
-                    }
-                )
+        for row, symbol, parsed_exp, strategy, strike in zip(kept_rows, kept_symbols, exps, strategies, strikes):
+            if parsed_exp is not None and parsed_exp != expiration:
+                continue
+            cols = sides.get(strategy)
+            if cols is None:
+                continue
+
+            cols["_contractSymbolKey"].append(self._normalize_osi_symbol(symbol))
+            cols["contractSymbol"].append(symbol)
+            cols["strategy"].append(strategy)
+            cols["strike"].append(strike)
+            cols["bid"].append(self._as_float(_first(row, "bid", "bidPrice")))
+            cols["ask"].append(self._as_float(_first(row, "ask", "askPrice")))
+            cols["lastPrice"].append(self._as_float(_first(row, "last", "lastPrice")))
+            cols["volume"].append(self._as_int(row.get("volume")))
+            cols["openInterest"].append(self._as_int(_first(row, "openInterest", "open_interest")))
+            cols["impliedVolatility"].append(self._as_float(_first(row, "impliedVolatility", "iv")))
+            cols["delta"].append(None)
+        return sides
+
+    def _attach_greeks(self, chains: List[Dict[str, List[Any]]]) -> None:
+        """Fill delta (and missing IV) for every chain from one greeks lookup."""
+        symbols = [k for cols in chains for k in cols["_contractSymbolKey"] if k]
+        greeks = self._get_greeks(symbols)
+        for cols in chains:
+            ivs = cols["impliedVolatility"]
+            for i, sym in enumerate(cols.pop("_contractSymbolKey")):
+                g = greeks.get(sym)
+                if g is None:
+                    continue
+                cols["delta"][i] = g.get("delta")
+                if ivs[i] is None:
+                    ivs[i] = g.get("impliedVolatility")
+
+    @staticmethod
+    def _chain_frame(cols: Dict[str, List[Any]]) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                name: np.asarray(cols[name], dtype=float if name in _FLOAT_CHAIN_COLUMNS else object)
+                for name in _CHAIN_COLUMNS
+            }
+        )
+
+    def _split_chain(self, sides: Dict[str, Dict[str, List[Any]]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        return self._chain_frame(sides["CALL"]), self._chain_frame(sides["PUT"])
 
-            symbols = [o["_contractSymbolKey"] for o in options if o.get("_contractSymbolKey")]
-            greeks = self._get_greeks(symbols)
-            for option in options:
-                sym = option.get("_contractSymbolKey")
-                if sym in greeks:
-                    option["delta"] = greeks[sym].get("delta")
-                    if option.get("impliedVolatility") is None:
-                        option["impliedVolatility"] = greeks[sym].get("impliedVolatility")
-            for option in options:
-                option.pop("_contractSymbolKey", None)
-
-            calls_df = pd.DataFrame([o for o in options if o.get("strategy") == "CALL"])
-            puts_df = pd.DataFrame([o for o in options if o.get("strategy") == "PUT"])
-            return calls_df, puts_df
+    def get_options_chain(self, ticker: str, expiration: date) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        try:
+            sides = self._fetch_chain_options(ticker, expiration)
+            self._attach_greeks(list(sides.values()))
+            return self._split_chain(sides)
         except Exception as exc:
             self.logger.warning("%s %s: public option chain lookup failed: %s", ticker, expiration.isoformat(), exc)
             return pd.DataFrame(), pd.DataFrame()
+
+    def get_options_chains(
+        self, ticker: str, expirations: List[date], max_workers: int = 4
+    ) -> Dict[date, Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Fetch several expirations with one greeks lookup for all of them.
+
+        Chain requests run concurrently; the greeks for every returned contract
+        are then requested together instead of once per expiration.
+        """
+        if not expirations:
+            return {}
+
+        def _fetch(expiry: date) -> Optional[Dict[str, Dict[str, List[Any]]]]:
+            try:
+                return self._fetch_chain_options(ticker, expiry)
+            except Exception as exc:
+                self.logger.warning("%s %s: public option chain lookup failed: %s", ticker, expiry.isoformat(), exc)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(expirations)))) as executor:
+            fetched = dict(zip(expirations, executor.map(_fetch, expirations)))
+
+        try:
+            self._attach_greeks([cols for sides in fetched.values() if sides is not None for cols in sides.values()])
+        except Exception as exc:
+            # Keep the fetched chains; contracts just go without delta (and any missing IV).
+            self.logger.warning("%s: public greeks lookup failed, continuing without delta: %s", ticker, exc)
+        return {
+            expiry: self._split_chain(sides) if sides is not None else (pd.DataFrame(), pd.DataFrame())
+            for expiry, sides in fetched.items()
+        }
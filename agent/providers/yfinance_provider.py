@@ -1,11 +1,17 @@
 ﻿from __future__ import annotations
 
+import atexit
 import csv
+import json
 import logging
+import os
+import pickle
+import threading
 import time
+import warnings
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
 
 import pandas as pd
 import yfinance as yf
@@ -29,6 +35,50 @@ def _retry(fn, retries: int = 3, delay: float = 2.0):
             time.sleep(wait)
 
 
+def _clean_value(value: Any) -> Any:
+    """CSV cell for value: missing -> "", dates -> ISO strings, anything else unchanged."""
+    if value is None:
+        return ""
+    # Common cell types first, without pd.isna's dispatch: NaN is the only float != itself.
+    if isinstance(value, float):
+        return "" if value != value else value
+    if isinstance(value, (str, int)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return "" if value is pd.NaT else value.isoformat()
+    try:
+        if pd.isna(value):
+            return ""
+    except Exception:
+        pass
+    return value
+
+
+# _cached_value result when there is no fresh cache entry (None is a cacheable value).
+_CACHE_MISS = object()
+
+# pandas infer_dtype results whose values _clean_value would leave unchanged.
+_PLAIN_INFERRED_TYPES = frozenset(("string", "floating", "integer", "mixed-integer-float", "boolean", "empty"))
+
+# quoteType values (as stored, upper-case) for instruments that never report earnings.
+_NON_EARNINGS_QUOTE_TYPES = frozenset({"ETF", "INDEX", "MUTUALFUND", "CRYPTOCURRENCY", "CURRENCY"})
+
+
+def _earliest_future_date(values: pd.Series, today: date) -> Optional[Tuple[Any, date]]:
+    """(index label, date) of the earliest value dated today or later, parsed and searched in one pass."""
+    if values.empty:
+        return None
+    stamps = pd.to_datetime(values, errors="coerce", format="mixed")
+    if stamps.dt.tz is not None:
+        stamps = stamps.dt.tz_localize(None)  # keep the local calendar date
+    # Stable sort keeps the first-listed label on ties; a binary search then finds today.
+    days = stamps.dt.normalize().dropna().sort_values(kind="stable")
+    pos = int(days.searchsorted(pd.Timestamp(today)))
+    if pos >= len(days):
+        return None
+    return days.index[pos], days.iloc[pos].date()
+
+
 class YFinanceProvider(OptionsDataProvider):
     CSV_FIELDS = [
         "timestamp_utc",
@@ -56,90 +106,309 @@ class YFinanceProvider(OptionsDataProvider):
         "filtered",
         "filter_reason",
     ]
+    # Blank CSV row; copied per written row instead of rebuilt key by key.
+    _ROW_TEMPLATE = dict.fromkeys(CSV_FIELDS, "")
+    # How long a "no earnings" answer (ETF, unavailable) is trusted before asking yfinance again.
+    EARNINGS_UNAVAILABLE_TTL_SECONDS = 24 * 60 * 60
+    # Ticker CSV writes are buffered in memory and reach disk in chunks of this size (or at close()).
+    WRITE_BUFFER_BYTES = 256 * 1024
+    # Batches at least this large are written through a DataFrame instead of row by row.
+    FRAME_WRITE_MIN_ROWS = 32
+    # Chain columns copied into the options_chain log rows.
+    CHAIN_LOG_COLUMNS = (
+        "contractSymbol",
+        "strike",
+        "bid",
+        "ask",
+        "lastPrice",
+        "volume",
+        "openInterest",
+        "impliedVolatility",
+    )
 
-    def __init__(self, logger, log_dir: str = "./logs") -> None:
+    def __init__(
+        self,
+        logger,
+        log_dir: str = "./logs",
+        cache_dir: Optional[str] = None,
+        cache_ttl_minutes: float = 0,
+    ) -> None:
         self.logger = logger
         # yfinance can emit noisy warnings for symbols without fundamentals (e.g., ETFs).
         logging.getLogger("yfinance").setLevel(logging.ERROR)
         self.ticker_data_dir = Path(log_dir) / "ticker_data"
         self.ticker_data_dir.mkdir(parents=True, exist_ok=True)
-        # Cache of paths whose schema has already been verified this run
-        self._schema_ok: Set[Path] = set()
+        # Ticker CSV path -> header present and schema verified this run.
+        self._csv_state: Dict[Path, bool] = {}
+        # Ticker CSVs stay open for the run: path -> (file, writer, per-file lock).
+        self._writers: Dict[Path, Tuple[TextIO, Any, threading.Lock]] = {}
+        self._writers_lock = threading.Lock()
+        atexit.register(self.close)
+        # Optional on-disk cache of raw yfinance responses (disabled when ttl <= 0)
+        self.cache_ttl_seconds = float(cache_ttl_minutes or 0) * 60.0
+        self.response_cache_dir: Optional[Path] = None
+        if cache_dir and self.cache_ttl_seconds > 0:
+            self.response_cache_dir = Path(cache_dir) / "yfinance"
+            self.response_cache_dir.mkdir(parents=True, exist_ok=True)
+            self._prune_response_cache()
+        # Histories from get_price_history_batch, consumed by get_price_history.
+        self._history_batch: Dict[Tuple[str, str, str], pd.DataFrame] = {}
+        self._history_batch_lock = threading.Lock()
+        # quoteType never changes for a symbol, so t.info lookups are remembered across runs.
+        self._quote_types_path = self.ticker_data_dir / "quote_types.json"
+        self._quote_types: Dict[str, str] = {
+            str(k).upper(): str(v) for k, v in self._load_json(self._quote_types_path).items()
+        }
+        self._quote_types_lock = threading.Lock()
+        # Earnings answers (including "none") persisted between runs; see _known_earnings_date.
+        self._earnings_cache_path = self.ticker_data_dir / "_earnings_cache.json"
+        self._earnings_cache: Dict[str, Any] = self._load_json(self._earnings_cache_path)
+        self._earnings_cache_lock = threading.Lock()
+        # One yf.Ticker per symbol, reused by every call for that symbol.
+        self._tickers: Dict[str, yf.Ticker] = {}
+        self._tickers_lock = threading.Lock()
 
-    def _csv_path(self, ticker: str) -> Path:
-        return self.ticker_data_dir / f"{ticker.upper()}_yfinance_data.csv"
+    def _ticker(self, ticker: str) -> yf.Ticker:
+        key = ticker.upper()
+        with self._tickers_lock:
+            t = self._tickers.get(key)
+            if t is None:
+                t = self._tickers[key] = yf.Ticker(ticker)
+            return t
 
-    def _clean_value(self, value):
-        if value is None:
-            return ""
+    def _cache_path(self, key: str) -> Optional[Path]:
+        if self.response_cache_dir is None:
+            return None
+        return self.response_cache_dir / f"{key}_{date.today():%Y%m%d}.pkl"
+
+    def _prune_response_cache(self) -> None:
+        """Delete cache files that can no longer be served: keyed to an earlier day or past the TTL.
+
+        Temp files are only removed once past the TTL, so a concurrent run's
+        in-progress write is left alone.
+        """
+        today_suffix = f"_{date.today():%Y%m%d}.pkl"
+        cutoff = time.time() - self.cache_ttl_seconds
+        for path in self.response_cache_dir.iterdir():
+            try:
+                old_day = path.suffix == ".pkl" and not path.name.endswith(today_suffix)
+                if old_day or path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                self.logger.warning("Could not remove stale cache file %s: %s", path.name, exc)
+
+    def _cached_value(self, key: str) -> Any:
+        """The fresh on-disk cache entry for key, or _CACHE_MISS."""
+        path = self._cache_path(key)
+        if path is None:
+            return _CACHE_MISS
         try:
-            if pd.isna(value):
-                return ""
-        except Exception:
+            if time.time() - path.stat().st_mtime < self.cache_ttl_seconds:
+                with path.open("rb") as f:
+                    return pickle.load(f)
+        except FileNotFoundError:
             pass
-        if isinstance(value, (datetime, date)):
-            return value.isoformat()
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as exc:
+            self.logger.warning("Ignoring unreadable cache file %s: %s", path.name, exc)
+        return _CACHE_MISS
+
+    def _cached(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return fetch() memoized on disk for cache_ttl_minutes, keyed by key + today's date."""
+        path = self._cache_path(key)
+        if path is None:
+            return fetch()
+        value = self._cached_value(key)
+        if value is not _CACHE_MISS:
+            return value
+
+        value = fetch()
+        # Write to a private temp file first so concurrent readers never see a partial pickle.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            self.logger.warning("Could not write cache file %s: %s", path.name, exc)
         return value
 
+    def _csv_path(self, ticker: str) -> Path:
+        return self.ticker_data_dir / f"{ticker.upper()}_yfinance_data.csv"
+
     def _append_rows(self, ticker: str, rows: List[dict]) -> None:
         if not rows:
             return
         path = self._csv_path(ticker)
-        if path not in self._schema_ok:
-            self._ensure_schema(path)
-            self._schema_ok.add(path)
         try:
-            is_new = not path.exists()
-            with path.open("a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
-                if is_new:
-                    writer.writeheader()
+            f, writer, lock = self._writer(path)
+            with lock:
+                if len(rows) >= self.FRAME_WRITE_MIN_ROWS:
+                    self._write_frame(f, ticker, rows)
+                    return
+                timestamp = datetime.now(timezone.utc).isoformat()
+                symbol = ticker.upper()
+                fields = self.CSV_FIELDS
+                cells = []
                 for row in rows:
-                    payload = {k: "" for k in self.CSV_FIELDS}
+                    payload = self._ROW_TEMPLATE.copy()
                     payload.update(row)
-                    payload["timestamp_utc"] = datetime.now(timezone.utc).isoformat()
-                    payload["ticker"] = ticker.upper()
-                    payload = {k: self._clean_value(v) for k, v in payload.items()}
-                    writer.writerow(payload)
+                    payload["timestamp_utc"] = timestamp
+                    payload["ticker"] = symbol
+                    cells.append([_clean_value(payload[k]) for k in fields])
+                # Positional writer: no per-row field-name check or dict-to-list step as with DictWriter.
+                writer.writerows(cells)
         except PermissionError as exc:
             # Logging/tracing must not break screening if file is open in another app.
             self.logger.warning("%s: ticker CSV locked, skipping write (%s)", ticker, exc)
         except OSError as exc:
             self.logger.warning("%s: ticker CSV write failed (%s)", ticker, exc)
 
-    def _ensure_schema(self, path: Path) -> None:
-        if not path.exists():
-            return
+    def _writer(self, path: Path) -> Tuple[TextIO, Any, threading.Lock]:
+        """Append handle for path, opened once per run; the header is written when the file is new."""
+        with self._writers_lock:
+            entry = self._writers.get(path)
+            if entry is None:
+                # The schema check doubles as the existence probe, once per path per run.
+                has_header = self._csv_state.get(path)
+                if has_header is None:
+                    has_header = self._ensure_schema(path)
+                f = path.open("a", newline="", encoding="utf-8", buffering=self.WRITE_BUFFER_BYTES)
+                writer = csv.writer(f)
+                if not has_header:
+                    writer.writerow(self.CSV_FIELDS)
+                self._csv_state[path] = True
+                entry = self._writers[path] = (f, writer, threading.Lock())
+            return entry
+
+    def close(self) -> None:
+        """Flush and close the ticker CSV handles kept open by _append_rows."""
+        with self._writers_lock:
+            writers, self._writers = self._writers, {}
+        for path, (f, _, lock) in writers.items():
+            with lock:
+                try:
+                    f.close()
+                except OSError as exc:
+                    self.logger.warning("Could not flush ticker CSV %s: %s", path.name, exc)
+
+    def _write_frame(self, f: TextIO, ticker: str, rows: List[dict]) -> None:
+        """Columnar equivalent of the row loop in _append_rows, for large batches."""
+        frame = pd.DataFrame(rows, columns=self.CSV_FIELDS, dtype=object)
+        frame["timestamp_utc"] = datetime.now(timezone.utc).isoformat()
+        frame["ticker"] = ticker.upper()
+        # NaN/None already render as "" via na_rep; only columns that may hold dates need cleaning.
+        for col in self.CSV_FIELDS:
+            if pd.api.types.infer_dtype(frame[col], skipna=True) not in _PLAIN_INFERRED_TYPES:
+                frame[col] = frame[col].map(_clean_value)
+        frame.to_csv(f, header=False, index=False, lineterminator="\r\n")
+
+    def _ensure_schema(self, path: Path) -> bool:
+        """Migrate an existing file's header to CSV_FIELDS; False when there is no file yet."""
         try:
+            # Common case: header already matches, so only the first line is read.
             with path.open("r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                existing_fields = reader.fieldnames or []
-                if existing_fields == self.CSV_FIELDS:
-                    return
-                rows = list(reader)
-            normalized_rows = []
-            for row in rows:
-                payload = {k: "" for k in self.CSV_FIELDS}
-                for k, v in row.items():
-                    if k in payload:
-                        payload[k] = v
-                normalized_rows.append(payload)
-            with path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
-                writer.writeheader()
-                if normalized_rows:
-                    writer.writerows(normalized_rows)
+                if next(csv.reader([f.readline()]), []) == self.CSV_FIELDS:
+                    return True
+            try:
+                # Every column stays text, so values round-trip unchanged. Values beyond the
+                # header's width are dropped, as DictReader did, hence the silenced warning.
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", pd.errors.ParserWarning)
+                    frame = pd.read_csv(
+                        path, dtype=str, index_col=False, keep_default_na=False, na_filter=False, encoding="utf-8"
+                    )
+            except pd.errors.EmptyDataError:
+                frame = pd.DataFrame(columns=self.CSV_FIELDS)
+            except pd.errors.ParserError:
+                # Ragged rows (more values than header fields); the row-wise migration tolerates them.
+                self._migrate_rows(path)
+                return True
+            frame = frame.reindex(columns=self.CSV_FIELDS).fillna("")
+            frame.to_csv(path, index=False, encoding="utf-8", lineterminator="\r\n")
+        except FileNotFoundError:
+            return False
         except PermissionError as exc:
             self.logger.warning("Could not migrate schema for %s (locked): %s", path.name, exc)
         except OSError as exc:
             self.logger.warning("Could not migrate schema for %s: %s", path.name, exc)
+        return True
+
+    def _migrate_rows(self, path: Path) -> None:
+        with path.open("r", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        normalized_rows = []
+        for row in rows:
+            payload = self._ROW_TEMPLATE.copy()
+            for k, v in row.items():
+                if k in payload:
+                    payload[k] = v
+            normalized_rows.append(payload)
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
+            writer.writeheader()
+            if normalized_rows:
+                writer.writerows(normalized_rows)
 
     def log_option_screen_result(self, ticker: str, row: dict) -> None:
         self._append_rows(ticker, [row])
 
+    def get_price_history_batch(self, tickers: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        """Download history for several tickers in one yf.download request.
+
+        Frames are held for the matching get_price_history(ticker, period, interval)
+        call, which then skips its own request; tickers missing from the download
+        are left to that per-ticker path.
+        """
+        out: Dict[str, pd.DataFrame] = {}
+        pending: List[str] = []
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            cached = self._cached_value(f"price_{ticker}_{period}_{interval}")
+            if isinstance(cached, pd.DataFrame) and not cached.empty:
+                out[ticker] = cached
+            else:
+                pending.append(ticker)
+        if pending:
+            try:
+                raw = _retry(
+                    lambda: yf.download(
+                        pending,
+                        period=period,
+                        interval=interval,
+                        auto_adjust=False,
+                        actions=True,
+                        ignore_tz=False,
+                        group_by="ticker",
+                        threads=True,
+                        progress=False,
+                    )
+                )
+            except Exception as exc:
+                self.logger.info("Batch price history download failed, using per-ticker requests: %s", exc)
+                raw = None
+            if isinstance(raw, pd.DataFrame) and isinstance(raw.columns, pd.MultiIndex):
+                downloaded = set(raw.columns.get_level_values(0))
+                for ticker in pending:
+                    if ticker not in downloaded:
+                        continue
+                    df = raw[ticker].dropna(how="all")
+                    if not df.empty:
+                        out[ticker] = self._cached(f"price_{ticker}_{period}_{interval}", lambda df=df: df)
+        with self._history_batch_lock:
+            for ticker, df in out.items():
+                self._history_batch[(ticker, period, interval)] = df
+        return out
+
     def get_price_history(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
-        t = yf.Ticker(ticker)
-        df = _retry(lambda: t.history(period=period, interval=interval, auto_adjust=False))
+        with self._history_batch_lock:
+            df = self._history_batch.pop((ticker.upper(), period, interval), None)
+        if df is None:
+            t = self._ticker(ticker)
+            df = self._cached(
+                f"price_{ticker.upper()}_{period}_{interval}",
+                lambda: _retry(lambda: t.history(period=period, interval=interval, auto_adjust=False)),
+            )
         if df is None or df.empty:
             self.logger.info(
                 "%s: yfinance history returned empty (period=%s interval=%s)",
@@ -182,9 +451,13 @@ class YFinanceProvider(OptionsDataProvider):
         return df
 
     def get_options_expirations(self, ticker: str) -> List[date]:
-        t = yf.Ticker(ticker)
+        t = self._ticker(ticker)
         expirations = []
-        for exp in list(_retry(lambda: t.options) or []):
+        raw_expirations = self._cached(
+            f"expirations_{ticker.upper()}",
+            lambda: list(_retry(lambda: t.options) or []),
+        )
+        for exp in raw_expirations:
             try:
                 expirations.append(date.fromisoformat(exp))
             except ValueError:
@@ -205,10 +478,17 @@ class YFinanceProvider(OptionsDataProvider):
         return expirations
 
     def get_options_chain(self, ticker: str, expiration: date) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        t = yf.Ticker(ticker)
-        chain = _retry(lambda: t.option_chain(expiration.isoformat()))
-        calls = chain.calls.copy() if chain and chain.calls is not None else pd.DataFrame()
-        puts = chain.puts.copy() if chain and chain.puts is not None else pd.DataFrame()
+        t = self._ticker(ticker)
+
+        def _fetch_chain() -> Tuple[pd.DataFrame, pd.DataFrame]:
+            chain = _retry(lambda: t.option_chain(expiration.isoformat()))
+            return (
+                chain.calls if chain and chain.calls is not None else pd.DataFrame(),
+                chain.puts if chain and chain.puts is not None else pd.DataFrame(),
+            )
+
+        # Fresh frames on every call (new from yfinance or unpickled), so no defensive copy is needed.
+        calls, puts = self._cached(f"chain_{ticker.upper()}_{expiration.isoformat()}", _fetch_chain)
 
         rows = []
         for option_type, df in [("CALL", calls), ("PUT", puts)]:
@@ -223,33 +503,99 @@ class YFinanceProvider(OptionsDataProvider):
                 )
                 continue
 
-            for _, r in df.iterrows():
-                rows.append(
-                    {
-                        "event": "options_chain",
-                        "expiration": expiration.isoformat(),
-                        "option_type": option_type,
-                        "contractSymbol": r.get("contractSymbol"),
-                        "strike": r.get("strike"),
-                        "bid": r.get("bid"),
-                        "ask": r.get("ask"),
-                        "lastPrice": r.get("lastPrice"),
-                        "volume": r.get("volume"),
-                        "openInterest": r.get("openInterest"),
-                        "impliedVolatility": r.get("impliedVolatility"),
-                        "status": "ok",
-                    }
-                )
+            constants = {
+                "event": "options_chain",
+                "expiration": expiration.isoformat(),
+                "option_type": option_type,
+                "status": "ok",
+            }
+            # One reindex (absent columns -> NaN) and plain tuples instead of a Series per row.
+            for values in df.reindex(columns=self.CHAIN_LOG_COLUMNS).itertuples(index=False, name=None):
+                row = dict(constants)
+                row.update(zip(self.CHAIN_LOG_COLUMNS, values))
+                rows.append(row)
         self._append_rows(ticker, rows)
         return calls, puts
 
     def get_earnings_date(self, ticker: str) -> Optional[date]:
-        t = yf.Ticker(ticker)
+        known = self._known_earnings_date(ticker)
+        if known is not _CACHE_MISS:
+            return known
+        # Not routed through _cached: a failed lookup also returns None, and only answers
+        # that came back cleanly are persisted (by _remember_earnings_date).
+        return self._lookup_earnings_date(ticker)
+
+    def _load_json(self, path: Path) -> Dict[str, Any]:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            self.logger.warning("Ignoring unreadable %s: %s", path.name, exc)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_json(self, path: Path, data: Dict[str, Any]) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            self.logger.warning("Could not write %s: %s", path.name, exc)
+
+    def _known_earnings_date(self, ticker: str) -> Any:
+        """Persisted earnings answer that is still current, else _CACHE_MISS.
+
+        A date stays valid until it passes; "no earnings" for
+        EARNINGS_UNAVAILABLE_TTL_SECONDS after it was recorded.
+        """
+        with self._earnings_cache_lock:
+            entry = self._earnings_cache.get(ticker.upper())
+        if not isinstance(entry, dict):
+            return _CACHE_MISS
+        try:
+            value = entry.get("earnings_date")
+            if value is None:
+                age = datetime.now(timezone.utc) - datetime.fromisoformat(entry["cached_at"])
+                return None if age.total_seconds() < self.EARNINGS_UNAVAILABLE_TTL_SECONDS else _CACHE_MISS
+            earnings_date = date.fromisoformat(value)
+        except (KeyError, TypeError, ValueError):
+            return _CACHE_MISS
+        return earnings_date if earnings_date >= date.today() else _CACHE_MISS
+
+    def _remember_earnings_date(self, ticker: str, earnings_date: Optional[date]) -> None:
+        with self._earnings_cache_lock:
+            self._earnings_cache[ticker.upper()] = {
+                "earnings_date": earnings_date.isoformat() if earnings_date else None,
+                "cached_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._save_json(self._earnings_cache_path, self._earnings_cache)
+
+    def _quote_type(self, ticker: str) -> str:
+        """quoteType for ticker; t.info is slow, so results are kept for the run and on disk."""
+        key = ticker.upper()
+        with self._quote_types_lock:
+            cached = self._quote_types.get(key)
+        if cached is not None:
+            return cached
+        t = self._ticker(ticker)
+        info = _retry(lambda: t.info) or {}
+        quote_type = str(info.get("quoteType") or "").upper()
+        if not quote_type:
+            return quote_type
+        with self._quote_types_lock:
+            self._quote_types[key] = quote_type
+            self._save_json(self._quote_types_path, self._quote_types)
+        return quote_type
+
+    def _lookup_earnings_date(self, ticker: str) -> Optional[date]:
+        t = self._ticker(ticker)
 
         # Skip earnings lookup for instrument types that do not report earnings.
         try:
-            info = _retry(lambda: t.info) or {}
-            quote_type = str(info.get("quoteType", "")).upper()
+            quote_type = self._quote_type(ticker)
             self._append_rows(
                 ticker,
                 [
@@ -260,7 +606,7 @@ class YFinanceProvider(OptionsDataProvider):
                     }
                 ],
             )
-            if quote_type in {"ETF", "INDEX", "MUTUALFUND", "CRYPTOCURRENCY", "CURRENCY"}:
+            if quote_type in _NON_EARNINGS_QUOTE_TYPES:
                 self.logger.info("%s: quoteType=%s does not have earnings; skipping", ticker, quote_type)
                 self._append_rows(
                     ticker,
@@ -272,6 +618,7 @@ class YFinanceProvider(OptionsDataProvider):
                         }
                     ],
                 )
+                self._remember_earnings_date(ticker, None)
                 return None
         except Exception as exc:
             self.logger.info("%s: quoteType lookup failed: %s", ticker, exc)
@@ -303,28 +650,23 @@ class YFinanceProvider(OptionsDataProvider):
             if isinstance(cal, pd.DataFrame) and not cal.empty:
                 # Only look at rows whose index label mentions "Earnings" to avoid
                 # returning ex-dividend or other dates.
-                earnings_rows = [
-                    idx for idx in cal.index
-                    if "earning" in str(idx).lower()
-                ]
-                search_rows = earnings_rows if earnings_rows else list(cal.index)
-                for row_label in search_rows:
-                    for col in cal.columns:
-                        val = cal.loc[row_label, col]
-                        dt = pd.to_datetime(val, errors="coerce")
-                        if pd.notna(dt) and dt.date() >= today:
-                            self._append_rows(
-                                ticker,
-                                [
-                                    {
-                                        "event": "earnings_lookup",
-                                        "status": "ok",
-                                        "earnings_date": dt.date().isoformat(),
-                                        "message": f"source=calendar row={row_label}",
-                                    }
-                                ],
-                            )
-                            return dt.date()
+                mask = cal.index.astype(str).str.lower().str.contains("earning", regex=False)
+                found = _earliest_future_date((cal[mask] if mask.any() else cal).stack(), today)
+                if found is not None:
+                    (row_label, _), earnings_date = found
+                    self._append_rows(
+                        ticker,
+                        [
+                            {
+                                "event": "earnings_lookup",
+                                "status": "ok",
+                                "earnings_date": earnings_date.isoformat(),
+                                "message": f"source=calendar row={row_label}",
+                            }
+                        ],
+                    )
+                    self._remember_earnings_date(ticker, earnings_date)
+                    return earnings_date
         except Exception as exc:
             self.logger.info("%s: calendar earnings lookup failed: %s", ticker, exc)
             self._append_rows(
@@ -353,22 +695,23 @@ class YFinanceProvider(OptionsDataProvider):
                 )
             if isinstance(earnings, pd.DataFrame) and not earnings.empty:
                 today = date.today()
-                # Return the first FUTURE earnings date, skipping past ones.
-                for idx in earnings.index:
-                    dt = pd.to_datetime(idx, errors="coerce")
-                    if pd.notna(dt) and dt.date() >= today:
-                        self._append_rows(
-                            ticker,
-                            [
-                                {
-                                    "event": "earnings_lookup",
-                                    "status": "ok",
-                                    "earnings_date": dt.date().isoformat(),
-                                    "message": "source=earnings_dates",
-                                }
-                            ],
-                        )
-                        return dt.date()
+                # Return the nearest FUTURE earnings date, skipping past ones.
+                found = _earliest_future_date(pd.Series(earnings.index, index=earnings.index), today)
+                if found is not None:
+                    earnings_date = found[1]
+                    self._append_rows(
+                        ticker,
+                        [
+                            {
+                                "event": "earnings_lookup",
+                                "status": "ok",
+                                "earnings_date": earnings_date.isoformat(),
+                                "message": "source=earnings_dates",
+                            }
+                        ],
+                    )
+                    self._remember_earnings_date(ticker, earnings_date)
+                    return earnings_date
         except Exception as exc:
             msg = str(exc)
             if (
@@ -387,6 +730,7 @@ class YFinanceProvider(OptionsDataProvider):
                         }
                     ],
                 )
+                self._remember_earnings_date(ticker, None)
                 return None
             self.logger.info("%s: earnings_dates lookup failed: %s", ticker, exc)
             self._append_rows(
@@ -21,12 +21,21 @@ stall there, reducing assignment risk).
 
 from __future__ import annotations
 
+import heapq
 from datetime import date
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from agent.recommendation.csp_recommender import compute_ivr_proxy
+from agent.recommendation.csp_recommender import (
+    HVRange,
+    compute_hv_range,
+    compute_ivr_proxy,
+    delta_score_arrays,
+    expiration_ordinal,
+)
+from agent.signals.options_metrics import TERM_ORDER
 
 
 DEFAULT_CC_REC_CONFIG: Dict[str, Any] = {
@@ -41,7 +50,6 @@ DEFAULT_CC_REC_CONFIG: Dict[str, Any] = {
     "min_acceptable_sale_prices": {},  # ticker -> float, optional per-ticker floor
 }
 
-
 # ── Resistance levels ───────────────────────────────────────────────────────
 
 def get_resistance_levels(price_df: pd.DataFrame) -> Dict[str, Optional[float]]:
@@ -49,20 +57,18 @@ def get_resistance_levels(price_df: pd.DataFrame) -> Dict[str, Optional[float]]:
     if price_df is None or price_df.empty:
         return {"high_52w": None, "swing_high_20d": None}
 
-    high_col = (
-        price_df["High"].astype(float)
-        if "High" in price_df.columns
-        else price_df["Close"].astype(float)
-    )
-    high_52w = float(high_col.max())
-    swing_high_20d = float(high_col.rolling(20).max().iloc[-1]) if len(high_col) >= 20 else None
+    high_col = price_df["High"] if "High" in price_df.columns else price_df["Close"]
+    highs = high_col.to_numpy(dtype=np.float64)
+    high_52w = float(np.nanmax(highs))
+    # Only the last window matters, so reduce the 20-row tail rather than rolling the whole series.
+    swing_high_20d = float(highs[-20:].max()) if len(highs) >= 20 else None
     return {"high_52w": high_52w, "swing_high_20d": swing_high_20d}
 
 
 def _near_round_number(strike: float) -> bool:
     """True if strike is within 1% of the nearest $5 increment."""
     nearest = round(strike / 5) * 5
-    return abs(strike - nearest) / max(strike, 1e-6) < 0.01
+    return abs(strike - nearest) < 0.01 * max(strike, 1e-6)
 
 
 def _near_resistance(strike: float, resistance: Dict[str, Optional[float]], buffer: float) -> bool:
@@ -73,6 +79,22 @@ def _near_resistance(strike: float, resistance: Dict[str, Optional[float]], buff
     return False
 
 
+def _earnings_window(earnings_date: Optional[date], buffer_days: int) -> Optional[Tuple[int, int]]:
+    """Ordinal range of expirations that land on or within buffer_days after earnings."""
+    if earnings_date is None:
+        return None
+    start = earnings_date.toordinal()
+    return start, start + buffer_days
+
+
+def _earnings_ok(expiration: Any, window: Optional[Tuple[int, int]]) -> bool:
+    """True unless the expiration falls inside the earnings window (unparseable dates pass)."""
+    if window is None or not expiration:
+        return True
+    exp_ord = expiration_ordinal(str(expiration))
+    return exp_ord is None or not window[0] <= exp_ord <= window[1]
+
+
 # ── Per-bucket recommendation ───────────────────────────────────────────────
 
 def _make_base_row(
@@ -115,6 +137,7 @@ def _recommend_for_bucket(
     price_df: pd.DataFrame,
     rec_config: Dict[str, Any],
     max_suggestions: int = 3,
+    hv_range: Optional[HVRange] = None,
 ) -> List[Dict[str, Any]]:
     """
     Return up to max_suggestions ranked suggestions for one term bucket.
@@ -134,31 +157,17 @@ def _recommend_for_bucket(
         empty_row["reason"] = f"No {term_label} CALL candidates available"
         return [empty_row]
 
-    def _delta_ok(c: Dict) -> bool:
-        d = c.get("delta")
-        return d is not None and delta_min <= abs(float(d)) <= delta_max
-
-    def _earnings_ok(c: Dict) -> bool:
-        if earnings_date is None:
-            return True
-        c_exp_str = c.get("expiration")
-        if not c_exp_str:
-            return True
-        try:
-            c_exp = date.fromisoformat(str(c_exp_str))
-        except ValueError:
-            return True
-        days_before = (c_exp - earnings_date).days
-        return not (earnings_date <= c_exp and days_before <= earnings_buffer)
+    earnings_window = _earnings_window(earnings_date, earnings_buffer)
 
     # Prefer delta-qualified candidates; fill remaining slots from the rest.
-    by_score = lambda lst: sorted(lst, key=lambda x: float(x.get("score") or 0), reverse=True)
-    delta_ok = by_score([c for c in call_candidates if _delta_ok(c)])
-    delta_out = by_score([c for c in call_candidates if not _delta_ok(c)])
-    top_n = (delta_ok + delta_out)[:max_suggestions]
+    # One masked pass over delta/score arrays; lexsort is stable, matching sorted() on ties.
+    abs_delta, scores = delta_score_arrays(call_candidates)
+    in_range = (abs_delta >= delta_min) & (abs_delta <= delta_max)
+    top_n = np.lexsort((-scores, ~in_range))[:max_suggestions]
 
     results: List[Dict[str, Any]] = []
-    for best in top_n:
+    for i in top_n:
+        best = call_candidates[i]
         strike = float(best["strike"])
         premium = float(best.get("mid", 0))
         delta_val = best.get("delta")
@@ -167,19 +176,19 @@ def _recommend_for_bucket(
         near_round = _near_round_number(strike)
         near_res = _near_resistance(strike, resistance, resistance_buffer)
         below_min = min_acceptable_price is not None and strike < min_acceptable_price
-        delta_in_range = _delta_ok(best)
-        earnings_ok = _earnings_ok(best)
+        delta_in_range = bool(in_range[i])
+        abs_d = None if delta_val is None else float(abs_delta[i])
+        earnings_ok = _earnings_ok(best.get("expiration"), earnings_window)
 
         # IVR — informational only, does not affect verdict
         best_iv = float(best["implied_volatility"]) if best.get("implied_volatility") else None
-        ivr_value, ivr_source = compute_ivr_proxy(price_df, best_iv)
+        ivr_value, ivr_source = compute_ivr_proxy(price_df, best_iv, hv_range)
 
         # ── Verdict ────────────────────────────────────────────────────────
         issues: List[str] = []
         if not delta_in_range:
-            d = abs(float(delta_val)) if delta_val is not None else None
-            if d is not None:
-                issues.append(f"delta {d:.2f} outside target {delta_min:.2f}–{delta_max:.2f}")
+            if abs_d is not None:
+                issues.append(f"delta {abs_d:.2f} outside target {delta_min:.2f}–{delta_max:.2f}")
             else:
                 issues.append("delta unavailable")
         if not earnings_ok:
@@ -192,7 +201,7 @@ def _recommend_for_bucket(
             reason = "; ".join(issues)
         else:
             verdict = "Yes"
-            d_str = f"{abs(float(delta_val)):.2f}" if delta_val is not None else "n/a"
+            d_str = f"{abs_d:.2f}" if abs_d is not None else "n/a"
             reason = f"delta {d_str}"
             if near_res:
                 reason += "; strike near resistance (favourable)"
@@ -233,6 +242,8 @@ def _recommend_monthly_cc(
     earnings_date: Optional[date],
     min_acceptable_price: Optional[float],
     rec_config: Dict[str, Any],
+    hv_range: Optional[HVRange] = None,
+    resistance: Optional[Dict[str, Optional[float]]] = None,
 ) -> List[Dict[str, Any]]:
     """
     For each monthly expiration beyond max_dte, pick the single best CALL by
@@ -248,7 +259,9 @@ def _recommend_monthly_cc(
     delta_max = float(rec_config.get("delta_max", 0.25))
     earnings_buffer = int(rec_config.get("earnings_buffer_days", 7))
     resistance_buffer = float(rec_config.get("resistance_pct_buffer", 0.02))
-    resistance = get_resistance_levels(price_df)
+    if resistance is None:
+        resistance = get_resistance_levels(price_df)
+    earnings_window = _earnings_window(earnings_date, earnings_buffer)
 
     # Group by expiration date
     by_expiry: Dict[str, List[Dict[str, Any]]] = {}
@@ -277,25 +290,18 @@ def _recommend_monthly_cc(
         near_res = _near_resistance(strike, resistance, resistance_buffer)
         below_min = min_acceptable_price is not None and strike < min_acceptable_price
 
-        delta_in_range = delta_val is not None and delta_min <= abs(float(delta_val)) <= delta_max
+        abs_d = None if delta_val is None else abs(float(delta_val))
+        delta_in_range = abs_d is not None and delta_min <= abs_d <= delta_max
 
-        earnings_ok = True
-        if earnings_date is not None and exp_str:
-            try:
-                c_exp = date.fromisoformat(exp_str)
-                days_before = (c_exp - earnings_date).days
-                earnings_ok = not (earnings_date <= c_exp and days_before <= earnings_buffer)
-            except ValueError:
-                pass
+        earnings_ok = _earnings_ok(exp_str, earnings_window)
 
         best_iv = float(best["implied_volatility"]) if best.get("implied_volatility") else None
-        ivr_value, ivr_source = compute_ivr_proxy(price_df, best_iv)
+        ivr_value, ivr_source = compute_ivr_proxy(price_df, best_iv, hv_range)
 
         issues: List[str] = []
         if not delta_in_range:
-            d = abs(float(delta_val)) if delta_val is not None else None
-            if d is not None:
-                issues.append(f"delta {d:.2f} outside {delta_min:.2f}–{delta_max:.2f}")
+            if abs_d is not None:
+                issues.append(f"delta {abs_d:.2f} outside {delta_min:.2f}–{delta_max:.2f}")
             else:
                 issues.append("delta unavailable")
         if not earnings_ok:
@@ -308,7 +314,7 @@ def _recommend_monthly_cc(
             reason = "; ".join(issues)
         else:
             verdict = "Yes"
-            d_str = f"{abs(float(delta_val)):.2f}" if delta_val is not None else "n/a"
+            d_str = f"{abs_d:.2f}" if abs_d is not None else "n/a"
             reason = f"delta {d_str}; best annualized yield for month"
             if near_res:
                 reason += "; near resistance (favourable)"
@@ -350,6 +356,7 @@ def recommend_cc_for_ticker(
     min_acceptable_price: Optional[float],
     rec_config: Dict[str, Any],
     monthly_call_candidates: Optional[List[Dict[str, Any]]] = None,
+    hv_range: Optional[HVRange] = None,
 ) -> List[Dict[str, Any]]:
     """
     Produce CC suggestions (Short-Term / Medium-Term / Long-Term + Monthly) for one ticker.
@@ -368,12 +375,28 @@ def recommend_cc_for_ticker(
 
     max_suggestions = int(rec_config.get("max_suggestions_per_term", 3))
 
-    all_calls = [c for c in candidates if c.get("strategy") == "CALL"]
-    short_term_calls  = [c for c in all_calls if (c.get("dte") or 99) <= 14]
-    medium_term_calls = [c for c in all_calls if 14 < (c.get("dte") or 0) <= 28]
-    long_term_calls   = [c for c in all_calls if (c.get("dte") or 0) > 28]
+    short_term_calls: List[Dict[str, Any]] = []
+    medium_term_calls: List[Dict[str, Any]] = []
+    long_term_calls: List[Dict[str, Any]] = []
+    # One pass over candidates; a missing or zero DTE falls in no term.
+    for c in candidates:
+        dte = c.get("dte")
+        if c.get("strategy") != "CALL" or not dte:
+            continue
+        if dte <= 14:
+            short_term_calls.append(c)
+        elif dte <= 28:
+            medium_term_calls.append(c)
+        else:
+            long_term_calls.append(c)
 
-    resistance = get_resistance_levels(price_df)
+    # Price-history work is only needed when some term has candidates to judge.
+    # The HV series is the same for every suggestion; only the IV note differs.
+    resistance: Dict[str, Optional[float]] = {}
+    if short_term_calls or medium_term_calls or long_term_calls or monthly_call_candidates:
+        resistance = get_resistance_levels(price_df)
+        if hv_range is None:
+            hv_range = compute_hv_range(price_df)
 
     results: List[Dict[str, Any]] = []
     for term_label, pool in [
@@ -393,6 +416,7 @@ def recommend_cc_for_ticker(
                 price_df=price_df,
                 rec_config=rec_config,
                 max_suggestions=max_suggestions,
+                hv_range=hv_range,
             )
         )
 
@@ -406,6 +430,8 @@ def recommend_cc_for_ticker(
                 earnings_date=earnings_date,
                 min_acceptable_price=min_acceptable_price,
                 rec_config=rec_config,
+                hv_range=hv_range,
+                resistance=resistance,
             )
         )
 
@@ -445,15 +471,17 @@ def build_cc_recommendations(
             min_acceptable_price=min_price,
             rec_config=rec_config,
             monthly_call_candidates=tr.get("monthly_call_candidates", []),
+            hv_range=tr.get("hv_range"),
         )
         results.extend(recs)
 
-    term_order = {"Short-Term": 0, "Medium-Term": 1, "Long-Term": 2}
-    results.sort(
+    # Only the first max_recs rows are kept: a bounded heap selection, stable like sort().
+    return heapq.nsmallest(
+        max_recs,
+        results,
         key=lambda r: (
             r["ticker"],
-            term_order.get(r.get("term", ""), 9),
+            TERM_ORDER.get(r.get("term", ""), 9),
             -(float(r.get("annualized_yield") or 0)),
-        )
+        ),
     )
-    return results[:max_recs]
@@ -22,11 +22,17 @@ Terms produced per ticker:
 
 from __future__ import annotations
 
+import heapq
 import math
 from datetime import date
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from agent.signals.options_metrics import TERM_ORDER
 
 
 DEFAULT_REC_CONFIG: Dict[str, Any] = {
@@ -40,12 +46,38 @@ DEFAULT_REC_CONFIG: Dict[str, Any] = {
     "support_pct_buffer": 0.02,
 }
 
-
 # ── IVR proxy ──────────────────────────────────────────────────────────────────
 
+# (hv_low, hv_high, current_hv), or None with the reason the IVR proxy is unavailable.
+HVRange = Tuple[Optional[Tuple[float, float, float]], str]
+
+
+def compute_hv_range(price_df: pd.DataFrame) -> HVRange:
+    """
+    Range and latest value of the rolling 20-day annualised HV series.
+
+    This is the expensive part of compute_ivr_proxy; compute it once per
+    ticker and pass it to every compute_ivr_proxy call for that ticker.
+    """
+    if price_df is None or price_df.empty or len(price_df) < 25:
+        return None, "insufficient price history for IVR proxy"
+
+    # Plain NumPy over 20-row windows: for a few hundred rows pandas' rolling
+    # dispatch costs more than the arithmetic itself.
+    close = price_df["Close"].to_numpy(dtype=np.float64)
+    ret = close[1:] / close[:-1] - 1.0
+    ret = ret[~np.isnan(ret)]
+    if len(ret) < 24:
+        return None, "insufficient HV data for IVR proxy"
+    hv_series = sliding_window_view(ret, 20).std(axis=1, ddof=1) * math.sqrt(252)
+
+    return (float(hv_series.min()), float(hv_series.max()), float(hv_series[-1])), ""
+
+
 def compute_ivr_proxy(
     price_df: pd.DataFrame,
     current_iv: Optional[float],
+    hv_range: Optional[HVRange] = None,
 ) -> Tuple[Optional[float], str]:
     """
     HV Rank (IV Rank proxy) using a rolling 20-day annualised HV series.
@@ -57,20 +89,14 @@ def compute_ivr_proxy(
     NOT used in the formula, because IV includes a volatility risk premium
     (~20–40% above HV) that would inflate IVR and distort comparisons.
 
+    hv_range, when given, is compute_hv_range(price_df) computed by the caller.
+
     Returns (ivr 0–100 or None, human-readable source note).
     """
-    if price_df is None or price_df.empty or len(price_df) < 25:
-        return None, "insufficient price history for IVR proxy"
-
-    close = price_df["Close"].astype(float)
-    ret = close.pct_change().dropna()
-    hv_series = ret.rolling(20).std().dropna() * math.sqrt(252)
-
-    if len(hv_series) < 5:
-        return None, "insufficient HV data for IVR proxy"
-
-    hv_low = float(hv_series.min())
-    hv_high = float(hv_series.max())
+    stats, reason = hv_range if hv_range is not None else compute_hv_range(price_df)
+    if stats is None:
+        return None, reason
+    hv_low, hv_high, current_hv = stats
 
     if hv_high <= hv_low or hv_high < 1e-6:
         return None, "HV range too flat for IVR proxy"
@@ -79,7 +105,6 @@ def compute_ivr_proxy(
     # Option IV is NOT used in the formula because it includes a volatility risk
     # premium (~20-40% above HV), which would inflate IVR and cause misleading
     # comparisons, especially for leveraged ETFs where IV >> hv_high.
-    current_hv = float(hv_series.iloc[-1])
     iv_note = f"; option IV={current_iv * 100:.0f}%" if current_iv is not None and current_iv > 0 else ""
     source = f"proxy: HV rank (current HV={current_hv * 100:.0f}%{iv_note})"
 
@@ -94,22 +119,35 @@ def get_support_levels(price_df: pd.DataFrame) -> Dict[str, Optional[float]]:
     if price_df is None or price_df.empty:
         return {"low_52w": None, "swing_low_20d": None}
 
-    low_col = (
-        price_df["Low"].astype(float)
-        if "Low" in price_df.columns
-        else price_df["Close"].astype(float)
-    )
-    low_52w = float(low_col.min())
-    swing_low_20d = (
-        float(low_col.rolling(20).min().iloc[-1]) if len(low_col) >= 20 else None
-    )
+    low_col = price_df["Low"] if "Low" in price_df.columns else price_df["Close"]
+    lows = low_col.to_numpy(dtype=np.float64)
+    low_52w = float(np.nanmin(lows))
+    # Only the last window matters, so reduce the 20-row tail rather than rolling the whole series.
+    swing_low_20d = float(lows[-20:].min()) if len(lows) >= 20 else None
     return {"low_52w": low_52w, "swing_low_20d": swing_low_20d}
 
 
+@lru_cache(maxsize=1024)
+def expiration_ordinal(expiration: str) -> Optional[int]:
+    """date.toordinal() of an ISO expiration string, or None; candidates share few expirations, so memoized."""
+    try:
+        return date.fromisoformat(expiration).toordinal()
+    except ValueError:
+        return None
+
+
+def delta_score_arrays(candidates: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """|delta| (NaN when missing) and score (0 when missing) of each candidate, in list order."""
+    # One dict lookup per field; NumPy does the float conversion (None -> NaN) in C.
+    abs_delta = np.abs(np.array([c.get("delta") for c in candidates], dtype=np.float64))
+    scores = np.array([c.get("score") or 0 for c in candidates], dtype=np.float64)
+    return abs_delta, scores
+
+
 def _near_round_number(strike: float) -> bool:
     """True if strike is within 1% of the nearest $5 increment."""
     nearest = round(strike / 5) * 5
-    return abs(strike - nearest) / max(strike, 1e-6) < 0.01
+    return abs(strike - nearest) < 0.01 * max(strike, 1e-6)
 
 
 # ── Per-term recommendation helper ────────────────────────────────────────────
@@ -122,6 +160,8 @@ def _recommend_csp_for_term(
     technicals: Dict[str, float],
     earnings_date: Optional[date],
     rec_config: Dict[str, Any],
+    hv_range: Optional[HVRange] = None,
+    support: Optional[Dict[str, Optional[float]]] = None,
 ) -> Dict[str, Any]:
     """
     Produce one CSP recommendation for a single ticker and time-horizon term.
@@ -172,53 +212,41 @@ def _recommend_csp_for_term(
         (float(c["implied_volatility"]) for c in put_candidates if c.get("implied_volatility")),
         None,
     )
-    ivr_value, ivr_source = compute_ivr_proxy(price_df, current_iv)
+    ivr_value, ivr_source = compute_ivr_proxy(price_df, current_iv, hv_range)
 
     # ── Earnings proximity ─────────────────────────────────────────────────────
-    exp_date = None
     exp_str = put_candidates[0].get("expiration")
-    if exp_str:
-        try:
-            exp_date = date.fromisoformat(str(exp_str))
-        except ValueError:
-            pass
+    exp_ord = expiration_ordinal(str(exp_str)) if exp_str else None
 
     earnings_too_close = False
-    if earnings_date is not None and exp_date is not None:
-        days_before_exp = (exp_date - earnings_date).days
-        earnings_too_close = earnings_date <= exp_date and days_before_exp <= earnings_buffer
+    if earnings_date is not None and exp_ord is not None:
+        earnings_ord = earnings_date.toordinal()
+        earnings_too_close = earnings_ord <= exp_ord <= earnings_ord + earnings_buffer
 
     # ── Support levels ─────────────────────────────────────────────────────────
-    support = get_support_levels(price_df)
-
-    def _at_or_below_support(strike: float) -> bool:
-        if support["low_52w"] is not None and strike <= support["low_52w"] * (1 + support_buffer):
-            return True
-        if support["swing_low_20d"] is not None and strike <= support["swing_low_20d"] * (1 + support_buffer):
-            return True
-        if spot > 0 and (spot - strike) / spot >= 0.05:
-            return True
-        return False
-
-    def _delta_ok(c: Dict) -> bool:
-        d = c.get("delta")
-        if d is None:
-            return False
-        return delta_min <= abs(float(d)) <= delta_max
-
-    # Filter by delta + support
-    qualified = [
-        c for c in put_candidates
-        if _delta_ok(c) and (not use_support or _at_or_below_support(float(c.get("strike", 0))))
-    ]
+    if support is None:
+        support = get_support_levels(price_df)
+
+    # Filter by delta + support as boolean masks over the candidate arrays.
+    abs_delta, scores = delta_score_arrays(put_candidates)
+    delta_ok = (abs_delta >= delta_min) & (abs_delta <= delta_max)
+    qualified = delta_ok
+    if use_support:
+        strikes = np.array([c.get("strike", 0) for c in put_candidates], dtype=np.float64)
+        # spot > 0 is guaranteed above, so the ≥5% OTM test needs no guard.
+        at_support = (spot - strikes) / spot >= 0.05
+        for level in (support["low_52w"], support["swing_low_20d"]):
+            if level is not None:
+                at_support |= strikes <= level * (1 + support_buffer)
+        qualified = delta_ok & at_support
 
     # Relax support if nothing qualifies
     support_relaxed = False
-    if not qualified:
-        qualified = [c for c in put_candidates if _delta_ok(c)]
-        support_relaxed = bool(qualified)
+    if not qualified.any():
+        qualified = delta_ok
+        support_relaxed = bool(qualified.any())
 
-    if not qualified:
+    if not qualified.any():
         reasons: List[str] = []
         if ivr_value is not None and ivr_value < ivr_min:
             reasons.append(f"IVR {ivr_value:.0f}% below {ivr_min:.0f}% threshold")
@@ -230,8 +258,11 @@ def _recommend_csp_for_term(
         base["ivr_source"] = ivr_source
         return base
 
-    # Best = highest composite score (balances income, delta, trend, liquidity)
-    best = max(qualified, key=lambda x: float(x.get("score") or 0))
+    # Best = highest composite score (balances income, delta, trend, liquidity);
+    # argmax keeps the first of equal scores, as max() did.
+    idx = np.flatnonzero(qualified)
+    best_i = idx[np.argmax(scores[idx])]
+    best = put_candidates[best_i]
     strike = float(best["strike"])
     premium = float(best.get("mid", 0))
     delta_val = best.get("delta")
@@ -264,7 +295,7 @@ def _recommend_csp_for_term(
         reason = "; ".join(soft_fails)
     else:
         ivr_str = f"IVR {ivr_value:.0f}%" if ivr_value is not None else "IVR n/a"
-        reason = f"{ivr_str}; delta {abs(float(delta_val or 0)):.2f}; strike at/below support"
+        reason = f"{ivr_str}; delta {abs_delta[best_i]:.2f}; strike at/below support"
         verdict = "Yes"
 
     return {
@@ -296,15 +327,33 @@ def recommend_csp_for_ticker(
     technicals: Dict[str, float],
     earnings_date: Optional[date],
     rec_config: Dict[str, Any],
+    hv_range: Optional[HVRange] = None,
 ) -> List[Dict[str, Any]]:
     """
     Produce CSP recommendations (Short-Term / Medium-Term / Long-Term) for one ticker.
     Returns a flat list of recommendation dicts, one per term.
     """
-    all_puts = [c for c in candidates if c.get("strategy") == "PUT"]
-    short_term_puts  = [c for c in all_puts if (c.get("dte") or 99) <= 14]
-    medium_term_puts = [c for c in all_puts if 14 < (c.get("dte") or 0) <= 28]
-    long_term_puts   = [c for c in all_puts if (c.get("dte") or 0) > 28]
+    short_term_puts: List[Dict[str, Any]] = []
+    medium_term_puts: List[Dict[str, Any]] = []
+    long_term_puts: List[Dict[str, Any]] = []
+    # One pass over candidates; a missing or zero DTE falls in no term.
+    for c in candidates:
+        dte = c.get("dte")
+        if c.get("strategy") != "PUT" or not dte:
+            continue
+        if dte <= 14:
+            short_term_puts.append(c)
+        elif dte <= 28:
+            medium_term_puts.append(c)
+        else:
+            long_term_puts.append(c)
+
+    # Price-history work is only needed when some term has candidates to judge.
+    support: Optional[Dict[str, Optional[float]]] = None
+    if short_term_puts or medium_term_puts or long_term_puts:
+        support = get_support_levels(price_df)
+        if hv_range is None:
+            hv_range = compute_hv_range(price_df)
 
     results: List[Dict[str, Any]] = []
     for term_label, pool in [
@@ -321,6 +370,8 @@ def recommend_csp_for_ticker(
                 technicals=technicals,
                 earnings_date=earnings_date,
                 rec_config=rec_config,
+                hv_range=hv_range,
+                support=support,
             )
         )
     return results
@@ -354,14 +405,16 @@ def build_csp_recommendations(
             technicals=tr.get("technicals", {}),
             earnings_date=tr.get("earnings_date"),
             rec_config=rec_config,
+            hv_range=tr.get("hv_range"),
         )
         results.extend(recs)
 
-    term_order = {"Short-Term": 0, "Medium-Term": 1, "Long-Term": 2}
-    results.sort(
+    # Only the first max_recs rows are kept: a bounded heap selection, stable like sort().
+    return heapq.nsmallest(
+        max_recs,
+        results,
         key=lambda r: (
-            term_order.get(r.get("term", ""), 9),
+            TERM_ORDER.get(r.get("term", ""), 9),
             -(float(r.get("annualized_yield") or 0)),
-        )
+        ),
     )
-    return results[:max_recs]
@@ -1,51 +1,105 @@
 from __future__ import annotations
 
+import csv
+import os
 from datetime import date
+from functools import lru_cache
 from html import escape
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 
+from agent.signals.options_metrics import TERM_ORDER
+
+
+# Candidate report schema, in CSV column order.
+CANDIDATE_COLUMNS: List[str] = [
+    "run_date",
+    "ticker",
+    "bucket",
+    "bucket_label",
+    "expiration",
+    "strategy",
+    "contract_symbol",
+    "spot",
+    "strike",
+    "bid",
+    "ask",
+    "mid",
+    "spread_pct",
+    "volume",
+    "open_interest",
+    "implied_volatility",
+    "delta",
+    "delta_source",
+    "dte",
+    "annualized_yield",
+    "breakeven",
+    "max_profit",
+    "otm_pct",
+    "earnings_date",
+    "earnings_before_expiry",
+    "ma20",
+    "ma50",
+    "rsi14",
+    "hv20",
+    "score",
+    "why_ranked_high",
+    "ivr",
+    "ivr_source",
+]
+
+# Header of an empty report; ivr/ivr_source have always followed otm_pct there.
+_EMPTY_CANDIDATE_COLUMNS: List[str] = [
+    col
+    for name in CANDIDATE_COLUMNS
+    if name not in ("ivr", "ivr_source")
+    for col in ((name, "ivr", "ivr_source") if name == "otm_pct" else (name,))
+]
+
+# Columns that are always populated; nullable ones keep None so cells render as "-".
+_CANDIDATE_DTYPES: Dict[str, str] = {
+    "spot": "float64",
+    "strike": "float64",
+    "bid": "float64",
+    "ask": "float64",
+    "mid": "float64",
+    "spread_pct": "float64",
+    "volume": "int64",
+    "open_interest": "int64",
+    "delta": "float64",
+    "dte": "int64",
+    "annualized_yield": "float64",
+    "breakeven": "float64",
+    "earnings_before_expiry": "bool",
+    "ma20": "float64",
+    "ma50": "float64",
+    "rsi14": "float64",
+    "hv20": "float64",
+    "score": "float64",
+}
+
+
+def candidates_frame(candidates: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build the candidate DataFrame with a fixed column order and declared dtypes."""
+    columns = CANDIDATE_COLUMNS if candidates else _EMPTY_CANDIDATE_COLUMNS
+    return pd.DataFrame.from_records(candidates, columns=columns).astype(_CANDIDATE_DTYPES)
 
-def _empty_df() -> pd.DataFrame:
-    return pd.DataFrame(
-        columns=[
-            "run_date",
-            "ticker",
-            "bucket",
-            "bucket_label",
-            "expiration",
-            "strategy",
-            "contract_symbol",
-            "spot",
-            "strike",
-            "bid",
-            "ask",
-            "mid",
-            "spread_pct",
-            "volume",
-            "open_interest",
-            "implied_volatility",
-            "delta",
-            "delta_source",
-            "dte",
-            "annualized_yield",
-            "breakeven",
-            "max_profit",
-            "otm_pct",
-            "ivr",
-            "ivr_source",
-            "earnings_date",
-            "earnings_before_expiry",
-            "ma20",
-            "ma50",
-            "rsi14",
-            "hv20",
-            "score",
-            "why_ranked_high",
-        ]
-    )
+
+def _write_candidates_csv(df: pd.DataFrame, path: Path) -> None:
+    """Same bytes as df.to_csv(path, index=False), written from column lists with csv.writer."""
+    columns = []
+    for col in df.columns:
+        values = df[col].tolist()
+        if df[col].hasnans:
+            # Missing values are empty cells, as with to_csv's default na_rep.
+            values = ["" if missing else v for v, missing in zip(values, df[col].isna().tolist())]
+        columns.append(values)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(df.columns)
+        writer.writerows(zip(*columns))
 
 
 def _fmt_money(val: Optional[float], prefix: str = "$") -> str:
@@ -54,6 +108,53 @@ def _fmt_money(val: Optional[float], prefix: str = "$") -> str:
     return f"{prefix}{val:,.2f}"
 
 
+# Candidate table headers, in column order.
+_CANDIDATE_TABLE_HEADERS: Tuple[str, ...] = (
+    "Ticker",
+    "AnnualYield",
+    "Current",
+    "Strike",
+    "%OTM",
+    "Expiration",
+    "DTE",
+    "Premium",
+    "Delta",
+    "IVR",
+    "MaxProfit",
+    "Breakeven",
+    "Why",
+)
+
+
+def _pct_cell(val: Any) -> str:
+    return "-" if pd.isna(val) else f"{val:.2f}%"
+
+
+def _money_cell(val: Any) -> str:
+    return "-" if pd.isna(val) else f"${val:,.2f}"
+
+
+def _price_cell(val: Any) -> str:
+    try:
+        return f"${float(val):,.2f}"
+    except (ValueError, TypeError):
+        return "-"
+
+
+def _int_cell(val: Any) -> str:
+    try:
+        return str(int(float(val)))
+    except (ValueError, TypeError):
+        return "-"
+
+
+def _text_cell(val: Any) -> str:
+    try:
+        return "-" if pd.isna(val) else str(val)
+    except TypeError:
+        return str(val) if val is not None else "-"
+
+
 def _fmt_pct(val: Optional[float]) -> str:
     if val is None:
         return "-"
@@ -61,7 +162,6 @@ def _fmt_pct(val: Optional[float]) -> str:
 
 
 def _term_groups(recommendations: List[Dict[str, Any]]) -> List[Tuple[str, List[Dict[str, Any]]]]:
-    term_order = {"Short-Term": 0, "Medium-Term": 1, "Long-Term": 2}
     grouped: Dict[str, List[Dict[str, Any]]] = {}
     for rec in recommendations:
         term = rec.get("term") or "Other"
@@ -69,7 +169,7 @@ def _term_groups(recommendations: List[Dict[str, Any]]) -> List[Tuple[str, List[
 
     def _sort_key(item: Tuple[str, List[Dict[str, Any]]]) -> tuple:
         term = item[0]
-        base = term_order.get(term)
+        base = TERM_ORDER.get(term)
         if base is not None:
             return (base, "")
         # Monthly terms: sort by the expiration of the first entry so they appear
@@ -96,12 +196,105 @@ _SECTION_CONTROLS = (
 )
 
 
+# Document head and stylesheet, emitted as the first report fragments.
+_HTML_HEAD = (
+    "<!DOCTYPE html><html><head><meta charset='utf-8'>\n"
+    "<title>Options Report</title>\n"
+    "<style>"
+    "body{font-family:Segoe UI,Arial,sans-serif;margin:20px;background:#fff;}"
+    "h1{margin-bottom:8px;}"
+    "details{margin-bottom:6px;}"
+    "summary{cursor:pointer;padding:7px 12px;border-radius:4px;user-select:none;list-style:none;display:flex;align-items:center;gap:6px;}"
+    "summary::-webkit-details-marker{display:none;}"
+    "summary::before{content:'▸';font-size:14px;transition:transform 0.15s;}"
+    "details[open]>summary::before{transform:rotate(90deg);}"
+    ".section>summary{font-size:16px;font-weight:700;background:#0969da;color:#fff;border:none;}"
+    ".section>summary:hover{background:#0860ca;}"
+    ".section>summary::before{color:#fff;}"
+    ".ticker-block{margin-left:20px;}"
+    ".ticker-block>summary{font-size:13px;font-weight:600;background:#f6f8fa;border:1px solid #d0d7de;color:#24292f;}"
+    ".ticker-block>summary:hover{background:#eaf0fb;}"
+    ".rec-term{margin:0 0 8px 12px;}"
+    ".rec-term>summary{font-size:13px;font-weight:600;background:#f6f8fa;border:1px solid #d0d7de;color:#24292f;}"
+    ".rec-term>summary:hover{background:#eaf0fb;}"
+    ".report-controls{display:flex;gap:8px;margin:8px 0 14px;}"
+    ".report-controls button{border:1px solid #d0d7de;background:#f6f8fa;color:#24292f;border-radius:6px;padding:6px 12px;font-size:12px;font-weight:600;cursor:pointer;}"
+    ".report-controls button:hover{background:#eaeef2;}"
+    ".section-controls{display:flex;gap:6px;margin:0 0 8px;}"
+    ".section-controls button{border:1px solid #d0d7de;background:#f6f8fa;color:#24292f;border-radius:4px;padding:2px 8px;font-size:11px;font-weight:500;cursor:pointer;}"
+    ".section-controls button:hover{background:#eaeef2;}"
+    "table{border-collapse:collapse;width:auto;margin:6px 0 6px 20px;}"
+    "th,td{border:1px solid #d0d7de;padding:3px 6px;font-size:12px;text-align:left;white-space:nowrap;vertical-align:top;}"
+    "th{background:#f6f8fa;font-weight:600;}"
+    "tr:nth-child(even){background:#f9f9f9;}"
+    ".count{font-weight:400;font-size:13px;opacity:0.85;margin-left:6px;}"
+    ".note{font-size:12px;color:#444;padding:8px;background:#fff8c5;border:1px solid #e3b341;border-radius:4px;margin-bottom:12px;}"
+    "a{color:inherit;}"
+    ".section-puts>summary{background:#1a7f37;}"
+    ".section-puts>summary:hover{background:#166f30;}"
+    ".section-calls>summary{background:#6639ba;}"
+    ".section-calls>summary:hover{background:#5b33a8;}"
+    ".section-calls-monthly>summary{background:#3d1f8c;}"
+    ".section-calls-monthly>summary:hover{background:#32197a;}"
+    ".section-rec>summary{background:#9a6700;color:#fff;font-size:17px;}"
+    ".section-rec>summary:hover{background:#875d00;}"
+    ".section-rec>summary::before{color:#fff;}"
+    ".rec-body{padding:8px 12px 12px;}"
+    ".rec-table{margin:0 0 10px 0;width:100%;}"
+    ".rec-table th{background:#fdf0d5;font-size:12px;}"
+    ".rec-table td{font-size:12px;}"
+    ".rec-yes{background:#d4edda;color:#155724;font-weight:600;}"
+    ".rec-no{background:#f8d7da;color:#721c24;font-weight:600;}"
+    ".reason-cell{white-space:normal;min-width:180px;max-width:320px;font-size:11px;color:#444;}"
+    ".rec-footnote{font-size:11px;color:#666;margin:4px 0 8px;font-style:italic;}"
+    ".exit-rules{font-size:12px;background:#f0f7ff;border:1px solid #b6d4fe;border-radius:4px;padding:8px 12px;margin-top:4px;}"
+    ".exit-rules ul{margin:4px 0 0 16px;padding:0;}"
+    ".exit-rules li{margin-bottom:2px;}"
+    ".warn-banner{background:#fff3cd;border:2px solid #ffc107;border-radius:6px;padding:10px 14px;margin-bottom:14px;}"
+    ".warn-banner h3{margin:0 0 6px;color:#856404;font-size:14px;}"
+    ".warn-banner ul{margin:4px 0 0 18px;padding:0;color:#6c4a00;font-size:13px;}"
+    ".warn-banner li{margin-bottom:3px;}"
+    ".section-cc-rec>summary{background:#0d6efd;color:#fff;font-size:17px;}"
+    ".section-cc-rec>summary:hover{background:#0b5ed7;}"
+    ".section-cc-rec>summary::before{color:#fff;}"
+    ".section-cc-monthly>summary{background:#0a6640;color:#fff;font-size:17px;}"
+    ".section-cc-monthly>summary:hover{background:#085534;}"
+    ".section-cc-monthly>summary::before{color:#fff;}"
+    ".cc-rec-body{padding:8px 12px 12px;}"
+    ".cc-rec-table{margin:0 0 10px 0;width:100%;}"
+    ".cc-rec-table th{background:#dbeafe;font-size:12px;}"
+    ".cc-rec-table td{font-size:12px;}"
+    ".flag-res{color:#0d6efd;font-weight:600;}"
+    ".flag-round{color:#6c757d;}"
+    ".flag-below{color:#dc3545;font-weight:600;}"
+    "</style></head><body>"
+)
+
+_RISK_FOOTER = (
+    "<p><strong>Risk reminders:</strong> Assignment risk, overnight gaps, earnings/event shocks, "
+    "liquidity deterioration, and tail-risk moves can cause losses.</p>"
+)
+
+
+_VERDICT_CLASS: Dict[str, str] = {"Yes": "rec-yes", "No": "rec-no"}
+
+_FIDELITY_URL = "https://digital.fidelity.com/ftgw/digital/options-research/?symbol="
+
+
+@lru_cache(maxsize=None)
+def _ticker_link(ticker: str) -> str:
+    """Escaped Fidelity research link for a ticker; tickers repeat across every table, so memoized."""
+    return (
+        f"<a href='{escape(_FIDELITY_URL + ticker)}' target='_blank' rel='noopener noreferrer'>"
+        f"<strong>{escape(ticker)}</strong></a>"
+    )
+
+
 def _display_term_label(term: str) -> str:
     return _TERM_DISPLAY.get(term, term)
 
 
 def _render_sell_call_term(term: str, recommendations: List[Dict[str, Any]], html_parts: List[str]) -> None:
-    verdict_class = {"Yes": "rec-yes", "No": "rec-no"}
     group_colors = ("#ffffff", "#f1f3f5")
 
     html_parts.append("<details class='rec-term'>")
@@ -137,7 +330,6 @@ def _render_sell_call_term(term: str, recommendations: List[Dict[str, Any]], htm
             group_idx += 1
             prev_ticker = ticker
         row_bg = group_colors[group_idx % 2]
-        fidelity_url = f"https://digital.fidelity.com/ftgw/digital/options-research/?symbol={ticker}"
 
         spot_val = rec.get("spot")
         strike_val = rec.get("strike")
@@ -166,19 +358,19 @@ def _render_sell_call_term(term: str, recommendations: List[Dict[str, Any]], htm
         flags_html = " ".join(flags) if flags else "-"
 
         verdict = rec["recommend"]
-        css = verdict_class.get(verdict, "")
+        css = _VERDICT_CLASS.get(verdict, "")
         html_parts.append(
             f"<tr style='background-color:{row_bg}'>"
-            f"<td class='{css}'><a href='{escape(fidelity_url)}' target='_blank' rel='noopener noreferrer'><strong>{escape(ticker)}</strong></a></td>"
-            f"<td>{escape(yield_display)}</td>"
+            f"<td class='{css}'>{_ticker_link(ticker)}</td>"
+            f"<td>{yield_display}</td>"
             f"<td>{_fmt_money(spot_val)}</td>"
             f"<td>{_fmt_money(strike_val)}</td>"
-            f"<td>{escape(otm_pct)}</td>"
+            f"<td>{otm_pct}</td>"
             f"<td>{escape(str(rec.get('expiration') or '-'))}</td>"
             f"<td>{rec.get('dte') or '-'}</td>"
             f"<td>{_fmt_money(rec.get('premium'))}</td>"
             f"<td>{delta_display}</td>"
-            f"<td>{escape(ivr_display)}</td>"
+            f"<td>{ivr_display}</td>"
             f"<td>{_fmt_money(rec.get('max_profit'))}</td>"
             f"<td>{_fmt_money(rec.get('downside_breakeven'))}</td>"
             f"<td>{flags_html}</td>"
@@ -284,8 +476,11 @@ def _render_monthly_cc_recommendations(recommendations: List[Dict[str, Any]], ht
     html_parts.append("</details>")
 
 
+# Sell put reason suffix, indexed by near_support * 2 + near_round_number.
+_PUT_NEAR_FLAGS = ("", "round#", "support", "support round#")
+
+
 def _render_sell_put_term(term: str, recommendations: List[Dict[str, Any]], html_parts: List[str]) -> None:
-    verdict_class = {"Yes": "rec-yes", "No": "rec-no"}
     group_colors = ("#ffffff", "#f1f3f5")
 
     html_parts.append("<details class='rec-term'>")
@@ -321,24 +516,18 @@ def _render_sell_put_term(term: str, recommendations: List[Dict[str, Any]], html
             group_idx += 1
             prev_ticker = ticker
         row_bg = group_colors[group_idx % 2]
-        fidelity_url = f"https://digital.fidelity.com/ftgw/digital/options-research/?symbol={ticker}"
 
         ivr_display = _fmt_pct(rec.get("ivr"))
         ann_yield = rec.get("annualized_yield")
         yield_display = f"{ann_yield:.1%}" if ann_yield is not None else "-"
 
-        near_flags: List[str] = []
-        if rec.get("near_support"):
-            near_flags.append("support")
-        if rec.get("near_round_number"):
-            near_flags.append("round#")
-        near_str = " ".join(near_flags)
+        near_str = _PUT_NEAR_FLAGS[bool(rec.get("near_support")) * 2 + bool(rec.get("near_round_number"))]
         reason_full = rec.get("reason", "")
         if near_str:
             reason_full = f"{reason_full} [{near_str}]" if reason_full else near_str
 
         verdict = rec["recommend"]
-        css = verdict_class.get(verdict, "")
+        css = _VERDICT_CLASS.get(verdict, "")
         delta_raw = rec.get("delta")
         delta_display = f"{abs(float(delta_raw)):.3f}" if delta_raw is not None else "-"
         spot_val = rec.get("spot")
@@ -350,16 +539,16 @@ def _render_sell_put_term(term: str, recommendations: List[Dict[str, Any]], html
         )
         html_parts.append(
             f"<tr style='background-color:{row_bg}'>"
-            f"<td class='{css}'><a href='{escape(fidelity_url)}' target='_blank' rel='noopener noreferrer'><strong>{escape(ticker)}</strong></a></td>"
-            f"<td>{escape(yield_display)}</td>"
+            f"<td class='{css}'>{_ticker_link(ticker)}</td>"
+            f"<td>{yield_display}</td>"
             f"<td>{_fmt_money(spot_val)}</td>"
             f"<td>{_fmt_money(strike_val)}</td>"
-            f"<td>{escape(pct_to_strike)}</td>"
+            f"<td>{pct_to_strike}</td>"
             f"<td>{escape(str(rec.get('expiration') or '-'))}</td>"
             f"<td>{rec.get('dte') or '-'}</td>"
             f"<td>{_fmt_money(rec.get('premium'))}</td>"
             f"<td>{delta_display}</td>"
-            f"<td>{escape(ivr_display)}</td>"
+            f"<td>{ivr_display}</td>"
             f"<td>{_fmt_money(rec.get('max_profit'))}</td>"
             f"<td>{_fmt_money(rec.get('breakeven'))}</td>"
             f"<td>{_fmt_money(rec.get('cash_required'))}</td>"
@@ -414,7 +603,7 @@ def _render_csp_recommendations(recommendations: List[Dict[str, Any]], html_part
 
 
 def write_reports(
-    candidates: List[Dict[str, Any]],
+    candidates: Union[List[Dict[str, Any]], pd.DataFrame],
     config: Dict[str, Any],
     disclaimer: str,
     csp_recommendations: Optional[List[Dict[str, Any]]] = None,
@@ -429,84 +618,13 @@ def write_reports(
     csv_path = output_dir / f"{run_day}_options_report.csv"
     html_path = output_dir / f"{run_day}_options_report.html"
 
-    df = pd.DataFrame(candidates) if candidates else _empty_df()
+    # Callers that already hold the candidate frame pass it in to avoid rebuilding it.
+    df = candidates if isinstance(candidates, pd.DataFrame) else candidates_frame(candidates)
     if not df.empty:
         df = df.sort_values(["ticker", "bucket", "strategy", "score"], ascending=[True, True, True, False])
-    df.to_csv(csv_path, index=False)
+    _write_candidates_csv(df, csv_path)
 
-    html_parts: List[str] = []
-    html_parts.append("<!DOCTYPE html><html><head><meta charset='utf-8'>")
-    html_parts.append("<title>Options Report</title>")
-    html_parts.append(
-        "<style>"
-        "body{font-family:Segoe UI,Arial,sans-serif;margin:20px;background:#fff;}"
-        "h1{margin-bottom:8px;}"
-        "details{margin-bottom:6px;}"
-        "summary{cursor:pointer;padding:7px 12px;border-radius:4px;user-select:none;list-style:none;display:flex;align-items:center;gap:6px;}"
-        "summary::-webkit-details-marker{display:none;}"
-        "summary::before{content:'▸';font-size:14px;transition:transform 0.15s;}"
-        "details[open]>summary::before{transform:rotate(90deg);}"
-        ".section>summary{font-size:16px;font-weight:700;background:#0969da;color:#fff;border:none;}"
-        ".section>summary:hover{background:#0860ca;}"
-        ".section>summary::before{color:#fff;}"
-        ".ticker-block{margin-left:20px;}"
-        ".ticker-block>summary{font-size:13px;font-weight:600;background:#f6f8fa;border:1px solid #d0d7de;color:#24292f;}"
-        ".ticker-block>summary:hover{background:#eaf0fb;}"
-        ".rec-term{margin:0 0 8px 12px;}"
-        ".rec-term>summary{font-size:13px;font-weight:600;background:#f6f8fa;border:1px solid #d0d7de;color:#24292f;}"
-        ".rec-term>summary:hover{background:#eaf0fb;}"
-        ".report-controls{display:flex;gap:8px;margin:8px 0 14px;}"
-        ".report-controls button{border:1px solid #d0d7de;background:#f6f8fa;color:#24292f;border-radius:6px;padding:6px 12px;font-size:12px;font-weight:600;cursor:pointer;}"
-        ".report-controls button:hover{background:#eaeef2;}"
-        ".section-controls{display:flex;gap:6px;margin:0 0 8px;}"
-        ".section-controls button{border:1px solid #d0d7de;background:#f6f8fa;color:#24292f;border-radius:4px;padding:2px 8px;font-size:11px;font-weight:500;cursor:pointer;}"
-        ".section-controls button:hover{background:#eaeef2;}"
-        "table{border-collapse:collapse;width:auto;margin:6px 0 6px 20px;}"
-        "th,td{border:1px solid #d0d7de;padding:3px 6px;font-size:12px;text-align:left;white-space:nowrap;vertical-align:top;}"
-        "th{background:#f6f8fa;font-weight:600;}"
-        "tr:nth-child(even){background:#f9f9f9;}"
-        ".count{font-weight:400;font-size:13px;opacity:0.85;margin-left:6px;}"
-        ".note{font-size:12px;color:#444;padding:8px;background:#fff8c5;border:1px solid #e3b341;border-radius:4px;margin-bottom:12px;}"
-        "a{color:inherit;}"
-        ".section-puts>summary{background:#1a7f37;}"
-        ".section-puts>summary:hover{background:#166f30;}"
-        ".section-calls>summary{background:#6639ba;}"
-        ".section-calls>summary:hover{background:#5b33a8;}"
-        ".section-calls-monthly>summary{background:#3d1f8c;}"
-        ".section-calls-monthly>summary:hover{background:#32197a;}"
-        ".section-rec>summary{background:#9a6700;color:#fff;font-size:17px;}"
-        ".section-rec>summary:hover{background:#875d00;}"
-        ".section-rec>summary::before{color:#fff;}"
-        ".rec-body{padding:8px 12px 12px;}"
-        ".rec-table{margin:0 0 10px 0;width:100%;}"
-        ".rec-table th{background:#fdf0d5;font-size:12px;}"
-        ".rec-table td{font-size:12px;}"
-        ".rec-yes{background:#d4edda;color:#155724;font-weight:600;}"
-        ".rec-no{background:#f8d7da;color:#721c24;font-weight:600;}"
-        ".reason-cell{white-space:normal;min-width:180px;max-width:320px;font-size:11px;color:#444;}"
-        ".rec-footnote{font-size:11px;color:#666;margin:4px 0 8px;font-style:italic;}"
-        ".exit-rules{font-size:12px;background:#f0f7ff;border:1px solid #b6d4fe;border-radius:4px;padding:8px 12px;margin-top:4px;}"
-        ".exit-rules ul{margin:4px 0 0 16px;padding:0;}"
-        ".exit-rules li{margin-bottom:2px;}"
-        ".warn-banner{background:#fff3cd;border:2px solid #ffc107;border-radius:6px;padding:10px 14px;margin-bottom:14px;}"
-        ".warn-banner h3{margin:0 0 6px;color:#856404;font-size:14px;}"
-        ".warn-banner ul{margin:4px 0 0 18px;padding:0;color:#6c4a00;font-size:13px;}"
-        ".warn-banner li{margin-bottom:3px;}"
-        ".section-cc-rec>summary{background:#0d6efd;color:#fff;font-size:17px;}"
-        ".section-cc-rec>summary:hover{background:#0b5ed7;}"
-        ".section-cc-rec>summary::before{color:#fff;}"
-        ".section-cc-monthly>summary{background:#0a6640;color:#fff;font-size:17px;}"
-        ".section-cc-monthly>summary:hover{background:#085534;}"
-        ".section-cc-monthly>summary::before{color:#fff;}"
-        ".cc-rec-body{padding:8px 12px 12px;}"
-        ".cc-rec-table{margin:0 0 10px 0;width:100%;}"
-        ".cc-rec-table th{background:#dbeafe;font-size:12px;}"
-        ".cc-rec-table td{font-size:12px;}"
-        ".flag-res{color:#0d6efd;font-weight:600;}"
-        ".flag-round{color:#6c757d;}"
-        ".flag-below{color:#dc3545;font-weight:600;}"
-        "</style></head><body>"
-    )
+    html_parts: List[str] = [_HTML_HEAD]
     profile_name = str(config.get("active_profile") or "").strip()
     profile_suffix = f" (for {profile_name})" if profile_name else ""
     html_parts.append(f"<h1>Daily Options Screening Report{escape(profile_suffix)} &mdash; {run_day}</h1>")
@@ -546,108 +664,50 @@ def write_reports(
                 f"<summary>{escape(_display_term_label(term_label))}<span class='count'>({count_label})</span></summary>"
             )
 
-            tdf = term_df.copy()
+            # sort_values already returns a new frame, so no defensive copy before adding columns.
+            tdf = term_df.sort_values(
+                ["ticker", "expiration", "annualized_yield"], ascending=[True, True, False], na_position="last"
+            )
             for col in ("ivr", "max_profit"):
                 if col not in tdf.columns:
                     tdf[col] = None
 
-            tdf = tdf.sort_values(
-                ["ticker", "expiration", "annualized_yield"], ascending=[True, True, False], na_position="last"
-            )
-
-            view = tdf[
-                [
-                    "ticker",
-                    "annualized_yield",
-                    "spot",
-                    "strike",
-                    "otm_pct",
-                    "expiration",
-                    "dte",
-                    "mid",
-                    "delta",
-                    "ivr",
-                    "max_profit",
-                    "breakeven",
-                    "why_ranked_high",
-                ]
-            ].copy()
-            view["annualized_yield"] = (view["annualized_yield"] * 100).map(
-                lambda x: f"{x:.2f}%" if pd.notna(x) else "-"
-            )
-            view["otm_pct"] = view["otm_pct"].map(
-                lambda x: f"{x * 100:.2f}%" if pd.notna(x) else "-"
-            )
-            view["delta"] = view["delta"].map(lambda x: "-" if pd.isna(x) else f"{x:.3f}")
-            view["ivr"] = view["ivr"].map(
-                lambda x: "-" if pd.isna(x) or x is None else f"{x:.1f}%"
-            )
-            view["max_profit"] = view["max_profit"].map(
-                lambda x: "-" if pd.isna(x) or x is None else f"${x:,.2f}"
-            )
-            view["breakeven"] = view["breakeven"].map(
-                lambda x: "-" if pd.isna(x) or x is None else f"${x:,.2f}"
-            )
-            view = view.rename(
-                columns={
-                    "ticker": "Ticker",
-                    "annualized_yield": "AnnualYield",
-                    "spot": "Current",
-                    "strike": "Strike",
-                    "otm_pct": "%OTM",
-                    "expiration": "Expiration",
-                    "dte": "DTE",
-                    "mid": "Premium",
-                    "delta": "Delta",
-                    "ivr": "IVR",
-                    "max_profit": "MaxProfit",
-                    "breakeven": "Breakeven",
-                    "why_ranked_high": "Why",
-                }
-            )
+            # Format whole columns as plain lists, then emit rows from zip(); no
+            # per-row Series as with iterrows(). Only free-text columns need escaping.
+            tickers = tdf["ticker"].tolist()
+            columns = [
+                [_pct_cell(x) for x in (tdf["annualized_yield"] * 100).tolist()],
+                [_price_cell(x) for x in tdf["spot"].tolist()],
+                [_price_cell(x) for x in tdf["strike"].tolist()],
+                ["-" if pd.isna(x) else f"{x * 100:.2f}%" for x in tdf["otm_pct"].tolist()],
+                [escape(_text_cell(x)) for x in tdf["expiration"].tolist()],
+                [_int_cell(x) for x in tdf["dte"].tolist()],
+                [_price_cell(x) for x in tdf["mid"].tolist()],
+                ["-" if pd.isna(x) else f"{x:.3f}" for x in tdf["delta"].tolist()],
+                ["-" if pd.isna(x) else f"{x:.1f}%" for x in tdf["ivr"].tolist()],
+                [_money_cell(x) for x in tdf["max_profit"].tolist()],
+                [_money_cell(x) for x in tdf["breakeven"].tolist()],
+                [escape(_text_cell(x)) for x in tdf["why_ranked_high"].tolist()],
+            ]
 
-            display_cols = list(view.columns)
             tbl_html = ["<table class='table'><thead><tr>"]
-            for col in display_cols:
+            for col in _CANDIDATE_TABLE_HEADERS:
                 tbl_html.append(f"<th>{escape(col)}</th>")
             tbl_html.append("</tr></thead><tbody>")
 
             group_colors = ("#ffffff", "#f1f3f5")
             prev_ticker = None
             grp_idx = -1
-            for _, row in view.iterrows():
-                ticker_val = str(row.get("Ticker", ""))
+            for ticker, *cells in zip(tickers, *columns):
+                ticker_val = str(ticker)
                 if ticker_val != prev_ticker:
                     grp_idx += 1
                     prev_ticker = ticker_val
                 row_bg = group_colors[grp_idx % 2]
                 tbl_html.append(f"<tr style='background-color:{row_bg}'>")
-                for col in display_cols:
-                    cell = row[col]
-                    if col in ("Current", "Strike", "Premium"):
-                        try:
-                            cell_str = f"${float(cell):,.2f}"
-                        except (ValueError, TypeError):
-                            cell_str = "-"
-                    elif col == "DTE":
-                        try:
-                            cell_str = str(int(float(cell)))
-                        except (ValueError, TypeError):
-                            cell_str = "-"
-                    elif col == "Ticker":
-                        fidelity_url = f"https://digital.fidelity.com/ftgw/digital/options-research/?symbol={cell}"
-                        cell_str = (
-                            f"<a href='{escape(fidelity_url)}' target='_blank' rel='noopener noreferrer'>"
-                            f"<strong>{escape(str(cell))}</strong></a>"
-                        )
-                        tbl_html.append(f"<td>{cell_str}</td>")
-                        continue
-                    else:
-                        try:
-                            cell_str = "-" if pd.isna(cell) else str(cell)
-                        except TypeError:
-                            cell_str = str(cell) if cell is not None else "-"
-                    tbl_html.append(f"<td>{escape(cell_str)}</td>")
+                tbl_html.append(f"<td>{_ticker_link(ticker_val)}</td>")
+                for cell_str in cells:
+                    tbl_html.append(f"<td>{cell_str}</td>")
                 tbl_html.append("</tr>")
             tbl_html.append("</tbody></table>")
             html_parts.append("".join(tbl_html))
@@ -659,9 +719,11 @@ def write_reports(
             html_parts.append(f"<details class='section {css_class}'>")
             html_parts.append(f"<summary>{title}<span class='count'>({count_label})</span></summary>")
             html_parts.append(_SECTION_CONTROLS)
+            # One groupby pass instead of a boolean mask per term.
+            by_term = dict(tuple(section_df.groupby("bucket_label", sort=False)))
             for term_label in ("Short-Term", "Medium-Term", "Long-Term"):
-                term_df = section_df[section_df["bucket_label"] == term_label]
-                if not term_df.empty:
+                term_df = by_term.get(term_label)
+                if term_df is not None:
                     render_candidate_term(term_df, term_label)
             html_parts.append("</details>")
 
@@ -696,21 +758,22 @@ def write_reports(
                 render_candidate_term(groups[label], label)
             html_parts.append("</details>")
 
-        puts_df = df[df["strategy"] == "PUT"]
-        calls_df = df[df["strategy"] == "CALL"]
-
-        if not puts_df.empty:
-            render_section(puts_df, "Sell Put Candidates", "section-puts")
-        if not calls_df.empty:
-            render_section(calls_df, "Sell Call Candidates", "section-calls")
+        by_strategy = dict(tuple(df.groupby("strategy", sort=False)))
+        if "PUT" in by_strategy:
+            render_section(by_strategy["PUT"], "Sell Put Candidates", "section-puts")
+        if "CALL" in by_strategy:
+            render_section(by_strategy["CALL"], "Sell Call Candidates", "section-calls")
         render_monthly_call_section(monthly_call_candidates or [])
 
     html_parts.append("<hr>")
-    html_parts.append(
-        "<p><strong>Risk reminders:</strong> Assignment risk, overnight gaps, earnings/event shocks, "
-        "liquidity deterioration, and tail-risk moves can cause losses.</p>"
-    )
+    html_parts.append(_RISK_FOOTER)
     html_parts.append("</body></html>")
 
-    html_path.write_text("\n".join(html_parts), encoding="utf-8")
+    # Stream the fragments instead of joining (and then encoding) one large string;
+    # a 1 MiB buffer keeps the many small writes from each hitting the OS.
+    with html_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        for i, part in enumerate(html_parts):
+            if i:
+                f.write("\n")
+            f.write(part)
     return str(csv_path), str(html_path)
@@ -1,59 +1,60 @@
 ﻿from __future__ import annotations
 
 import math
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
 
-def _clamp_0_1(value: float) -> float:
-    return max(0.0, min(1.0, value))
 
+TechnicalLevels = Tuple[float, float, float, float]
 
-def score_candidate(row: Dict[str, Any], technicals: Dict[str, float], config: Dict[str, Any]) -> Tuple[float, str]:
-    strategy = row["strategy"]
+
+def technical_levels(technicals: Dict[str, float]) -> TechnicalLevels:
+    """Unpack (spot, ma20, ma50, rsi14) once per ticker for repeated score_candidate calls."""
+    return (
+        float(technicals["spot"]),
+        float(technicals["ma20"]),
+        float(technicals["ma50"]),
+        float(technicals["rsi14"]),
+    )
+
+
+# Per-strategy (delta target, trend step above an MA, trend step below an MA).
+# Covered calls are penalised below each MA as that is bearish for the held shares.
+_PUT_PARAMS = (-0.20, 0.20, 0.0)
+_CALL_PARAMS = (0.20, 0.15, -0.15)
+
+# Income-score normaliser: a 100% annualized yield maps to 1.0.
+_LOG1P_ONE = math.log1p(1.0)
+
+
+def score_candidate(row: Dict[str, Any], levels: TechnicalLevels, config: Dict[str, Any]) -> Tuple[float, str]:
+    target, above_ma, below_ma = _PUT_PARAMS if row["strategy"] == "PUT" else _CALL_PARAMS
 
     ann_yield = float(row.get("annualized_yield") or 0.0)
     # Logarithmic scale keeps differentiation at high yields (e.g. leveraged ETFs)
     # log1p(1.0) ≈ 0.693, so a 100% yield scores ~1.0; a 35% yield scores ~0.74
-    income_score = _clamp_0_1(math.log1p(ann_yield) / math.log1p(1.0))
+    income_score = max(0.0, min(1.0, math.log1p(ann_yield) / _LOG1P_ONE))
 
     delta = row.get("delta")
     if delta is None:
         delta_score = 0.45
         delta_reason = "delta fallback"
     else:
-        target = -0.20 if strategy == "PUT" else 0.20
         dist = abs(float(delta) - target)
-        delta_score = _clamp_0_1(1.0 - (dist / 0.25))
+        delta_score = max(0.0, min(1.0, 1.0 - (dist / 0.25)))
         delta_reason = f"delta {float(delta):.2f}"
 
-    spot = float(row.get("spot") or technicals["spot"])
-    ma20 = float(technicals["ma20"])
-    ma50 = float(technicals["ma50"])
-    rsi = float(technicals["rsi14"])
+    spot_t, ma20, ma50, rsi = levels
+    spot = float(row.get("spot") or spot_t)
 
-    if strategy == "PUT":
-        trend = 0.55
-        if spot > ma20:
-            trend += 0.20
-        if spot > ma50:
-            trend += 0.20
-        if rsi > 75:
-            trend -= 0.20
-        trend_reason = "bullish/neutral alignment"
-    else:
-        trend = 0.55
-        if spot > ma20:
-            trend += 0.15
-        else:
-            trend -= 0.15  # Below short-term MA — bearish for held shares
-        if spot > ma50:
-            trend += 0.15
-        else:
-            trend -= 0.15  # Below medium-term MA — bearish for held shares
-        if rsi > 75:
-            trend -= 0.20  # Overbought — elevated call-away risk
-        trend_reason = "bullish/neutral alignment"
-    trend_score = _clamp_0_1(trend)
+    trend = 0.55
+    trend += above_ma if spot > ma20 else below_ma
+    trend += above_ma if spot > ma50 else below_ma
+    if rsi > 75:
+        trend -= 0.20  # Overbought — pullback risk for puts, call-away risk for calls
+    trend_reason = "bullish/neutral alignment"
+    trend_score = max(0.0, min(1.0, trend))
 
     spread = float(row.get("spread_pct") or 1.0)
     oi = float(row.get("open_interest") or 0.0)
@@ -62,9 +63,9 @@ def score_candidate(row: Dict[str, Any], technicals: Dict[str, float], config: D
     if max_spread_cfg is None:
         spread_component = 0.5
     else:
-        spread_component = _clamp_0_1(1.0 - spread / max(float(max_spread_cfg), 1e-6))
-    oi_component = _clamp_0_1(oi / 2000.0)
-    vol_component = _clamp_0_1(vol / 500.0)
+        spread_component = max(0.0, min(1.0, 1.0 - spread / max(float(max_spread_cfg), 1e-6)))
+    oi_component = max(0.0, min(1.0, oi / 2000.0))
+    vol_component = max(0.0, min(1.0, vol / 500.0))
     liquidity_score = 0.5 * spread_component + 0.25 * oi_component + 0.25 * vol_component
 
     score = 0.40 * income_score + 0.25 * delta_score + 0.20 * trend_score + 0.15 * liquidity_score
@@ -80,3 +81,101 @@ def score_candidate(row: Dict[str, Any], technicals: Dict[str, float], config: D
         why += ", earnings-risk penalty applied"
 
     return score, why
+
+
+def score_candidate_records(
+    rows: List[Dict[str, Any]], technicals: Dict[str, float], config: Dict[str, Any]
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Vectorized counterpart of score_candidate for candidate dicts as produced by
+    build_option_records. Returns (scores, whys) aligned with rows; values match
+    the scalar path.
+
+    Reads the scoring fields straight into float arrays (None becomes NaN)
+    rather than building a DataFrame for a single batch.
+    """
+    if not rows:
+        return np.empty(0), []
+
+    def _floats(col: str) -> np.ndarray:
+        return np.array([row.get(col) for row in rows], dtype=float)
+
+    return _score_arrays(
+        np.array([row["strategy"] == "PUT" for row in rows]),
+        _floats("annualized_yield"),
+        _floats("delta"),
+        _floats("spot"),
+        _floats("spread_pct"),
+        _floats("open_interest"),
+        _floats("volume"),
+        np.array([bool(row.get("earnings_before_expiry")) for row in rows]),
+        technicals,
+        config,
+    )
+
+
+def _score_arrays(
+    is_put: np.ndarray,
+    ann_yield: np.ndarray,
+    delta: np.ndarray,
+    spot: np.ndarray,
+    spread: np.ndarray,
+    oi: np.ndarray,
+    vol: np.ndarray,
+    earnings_flag: np.ndarray,
+    technicals: Dict[str, float],
+    config: Dict[str, Any],
+) -> Tuple[np.ndarray, List[str]]:
+    n = len(is_put)
+
+    # Mirror the scalar `x or default` coercions: missing and zero both fall back.
+    ann_yield = np.nan_to_num(ann_yield, nan=0.0)
+    income_score = np.clip(np.log1p(ann_yield) / _LOG1P_ONE, 0.0, 1.0)
+
+    target, above_ma, below_ma = np.where(is_put[:, None], _PUT_PARAMS, _CALL_PARAMS).T
+    delta_score = np.where(
+        np.isnan(delta), 0.45, np.clip(1.0 - (np.abs(delta - target) / 0.25), 0.0, 1.0)
+    )
+
+    spot = np.where(np.isnan(spot) | (spot == 0), float(technicals["spot"]), spot)
+    ma20 = float(technicals["ma20"])
+    ma50 = float(technicals["ma50"])
+    rsi = float(technicals["rsi14"])
+
+    above20 = spot > ma20
+    above50 = spot > ma50
+    overbought = 0.20 if rsi > 75 else 0.0
+    trend = 0.55 + np.where(above20, above_ma, below_ma) + np.where(above50, above_ma, below_ma) - overbought
+    trend_score = np.clip(trend, 0.0, 1.0)
+
+    spread = np.where(np.isnan(spread) | (spread == 0), 1.0, spread)
+    oi = np.nan_to_num(oi, nan=0.0)
+    vol = np.nan_to_num(vol, nan=0.0)
+    max_spread_cfg = config.get("max_spread_pct")
+    if max_spread_cfg is None:
+        spread_component = np.full(n, 0.5)
+    else:
+        spread_component = np.clip(1.0 - spread / max(float(max_spread_cfg), 1e-6), 0.0, 1.0)
+    oi_component = np.clip(oi / 2000.0, 0.0, 1.0)
+    vol_component = np.clip(vol / 500.0, 0.0, 1.0)
+    liquidity_score = 0.5 * spread_component + 0.25 * oi_component + 0.25 * vol_component
+
+    scores = 0.40 * income_score + 0.25 * delta_score + 0.20 * trend_score + 0.15 * liquidity_score
+    scores = np.where(earnings_flag, scores * (1.0 - float(config["earnings_risk_penalty"])), scores)
+
+    # The arithmetic above is vectorized; only the text is built per row. Iterate
+    # over Python floats rather than numpy scalars, which format about 2x slower.
+    whys: List[str] = []
+    for ay, d, sp, o, v, earn in zip(
+        ann_yield.tolist(), delta.tolist(), spread.tolist(), oi.tolist(), vol.tolist(), earnings_flag.tolist()
+    ):
+        delta_reason = "delta fallback" if math.isnan(d) else f"delta {d:.2f}"
+        why = (
+            f"income={ay:.2%}, {delta_reason}, bullish/neutral alignment, "
+            f"spread={sp:.2%}, OI={int(o)}, vol={int(v)}"
+        )
+        if earn:
+            why += ", earnings-risk penalty applied"
+        whys.append(why)
+
+    return scores, whys
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import math
 from datetime import date
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+from scipy.special import ndtr
 
 
 def safe_float(value: Any, default: Optional[float] = None) -> Optional[float]:
@@ -50,8 +50,8 @@ def black_scholes_delta(
         return None
 
     if strategy == "CALL":
-        return norm.cdf(d1)
-    return norm.cdf(d1) - 1.0
+        return ndtr(d1)
+    return ndtr(d1) - 1.0
 
 
 def annualized_yield(strategy: str, credit: float, strike: float, spot: float, dte: int) -> Optional[float]:
@@ -75,6 +75,10 @@ def get_dte(expiration: date, today: date) -> int:
     return max((expiration - today).days, 0)
 
 
+# Display order of the term labels returned by get_term_for_dte.
+TERM_ORDER: Dict[str, int] = {"Short-Term": 0, "Medium-Term": 1, "Long-Term": 2}
+
+
 def get_term_for_dte(dte: int) -> Tuple[str, str]:
     """
     Map a DTE value to a (bucket_name, bucket_label) term tuple.
@@ -145,18 +149,111 @@ def select_expiration_dates(
     return sorted(set(result))
 
 
-def _passes_delta_or_otm(strategy: str, delta_value: Optional[float], otm_pct: Optional[float], config: Dict[str, Any]) -> bool:
+def _delta_otm_bounds(strategy: str, config: Dict[str, Any]) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """(delta_min, delta_max), (otm_min, otm_max) for the strategy, read once per chain."""
+    if strategy == "PUT":
+        return (
+            (float(config["delta_put_min"]), float(config["delta_put_max"])),
+            (float(config["put_otm_pct_min"]), float(config["put_otm_pct_max"])),
+        )
+    return (
+        (float(config["delta_call_min"]), float(config["delta_call_max"])),
+        (float(config["call_otm_pct_min"]), float(config["call_otm_pct_max"])),
+    )
+
+
+def _passes_delta_or_otm(
+    delta_value: Optional[float],
+    otm_pct: Optional[float],
+    delta_bounds: Tuple[float, float],
+    otm_bounds: Tuple[float, float],
+) -> bool:
     if delta_value is not None:
-        if strategy == "PUT":
-            return float(config["delta_put_min"]) <= delta_value <= float(config["delta_put_max"])
-        return float(config["delta_call_min"]) <= delta_value <= float(config["delta_call_max"])
+        return delta_bounds[0] <= delta_value <= delta_bounds[1]
 
     if otm_pct is None:
         return False
 
-    if strategy == "PUT":
-        return float(config["put_otm_pct_min"]) <= otm_pct <= float(config["put_otm_pct_max"])
-    return float(config["call_otm_pct_min"]) <= otm_pct <= float(config["call_otm_pct_max"])
+    return otm_bounds[0] <= otm_pct <= otm_bounds[1]
+
+
+# Chain fields read by build_option_records; absent ones are treated as all-missing.
+_CHAIN_COLUMNS = (
+    "strike",
+    "bid",
+    "ask",
+    "lastPrice",
+    "volume",
+    "openInterest",
+    "impliedVolatility",
+    "contractSymbol",
+)
+
+
+def _float_column(options_df: pd.DataFrame, col: str) -> np.ndarray:
+    """Column as float64 with unparseable or absent values as NaN."""
+    if col not in options_df.columns:
+        return np.full(len(options_df), np.nan)
+    return pd.to_numeric(options_df[col], errors="coerce").to_numpy(dtype=float)
+
+
+def _optional_floats(options_df: pd.DataFrame, col: str) -> List[Optional[float]]:
+    """safe_float() over a whole column: unparseable or missing values become None."""
+    return [None if math.isnan(v) else v for v in _float_column(options_df, col).tolist()]
+
+
+def _chain_numerics(
+    options_df: pd.DataFrame,
+    strategy: str,
+    spot: float,
+    dte: int,
+    min_annualized_yield: float,
+) -> Tuple[Dict[str, List[Optional[float]]], np.ndarray]:
+    """
+    Column-wise strike/bid/ask/mid/spread/yield/OTM for a whole chain.
+
+    Computed once per chain with numpy instead of per row; values match
+    spread_pct() and annualized_yield(). Unavailable values are None.
+
+    Also returns a boolean mask of the contracts that pass the strike, bid/ask,
+    spread, minimum-yield and OTM checks, the cheap filters that reject most
+    of a chain before any delta is computed.
+    """
+    strike = _float_column(options_df, "strike")
+    bid = np.nan_to_num(_float_column(options_df, "bid"), nan=0.0)
+    ask = np.nan_to_num(_float_column(options_df, "ask"), nan=0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mid = (bid + ask) / 2.0
+        sp = np.where((mid > 0) & (ask >= bid), (ask - bid) / mid, np.nan)
+        denom = strike * 100.0 if strategy == "PUT" else np.full(len(strike), spot * 100.0)
+        ann = np.where(denom > 0, (mid * 100.0) / denom * (365.0 / dte), np.nan)
+        if spot > 0:
+            otm = (spot - strike) / spot if strategy == "PUT" else (strike - spot) / spot
+        else:
+            otm = np.full(len(strike), np.nan)
+        viable = (
+            (strike > 0)
+            & (bid > 0)
+            & (ask > 0)
+            & ~np.isnan(sp)
+            & (ann >= min_annualized_yield)
+            & ~(otm < 0)
+        )
+
+    def _as_list(arr: np.ndarray) -> List[Optional[float]]:
+        return [None if math.isnan(v) else v for v in arr.tolist()]
+
+    numerics = {
+        "strike": _as_list(strike),
+        "bid": bid.tolist(),
+        "ask": ask.tolist(),
+        "mid": mid.tolist(),
+        "spread_pct": _as_list(sp),
+        "annualized_yield": _as_list(ann),
+        "otm_pct": _as_list(otm),
+    }
+    return numerics, viable
 
 
 def build_option_records(
@@ -172,9 +269,13 @@ def build_option_records(
     config: Dict[str, Any],
     logger,
     decision_logger: Optional[Callable[[dict], None]] = None,
+    today: Optional[date] = None,
+    dte: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-    today = date.today()
-    dte = get_dte(expiration, today)
+    today = today or date.today()
+    # Callers that already bucketed the expiration pass its DTE in.
+    if dte is None:
+        dte = get_dte(expiration, today)
     if dte <= 0:
         return []
 
@@ -183,35 +284,55 @@ def build_option_records(
         return []
 
     rows: List[Dict[str, Any]] = []
+    # Depends only on the expiration, so it is the same for every contract in the chain.
+    earnings_before_expiry = earnings_date is not None and today <= earnings_date <= expiration
+    earnings_date_str = earnings_date.isoformat() if earnings_date else ""
+    run_date_str = today.isoformat()
+    expiration_str = expiration.isoformat()
     missing_delta_count = 0
     min_oi = safe_float(config.get("min_open_interest"))
     min_vol = safe_float(config.get("min_volume"))
     max_sp = safe_float(config.get("max_spread_pct"))
     risk_free = safe_float(config.get("risk_free_rate"))
-
-    req_cols = [
-        "strike",
-        "bid",
-        "ask",
-        "lastPrice",
-        "volume",
-        "openInterest",
-        "impliedVolatility",
-        "contractSymbol",
-    ]
-    for c in req_cols:
+    # Thresholds are fixed for the chain; cast them once rather than per contract.
+    min_oi_int = int(min_oi) if min_oi is not None else None
+    min_vol_int = int(min_vol) if min_vol is not None else None
+    min_ann = float(config["min_annualized_yield"])
+    delta_bounds, otm_bounds = _delta_otm_bounds(strategy, config)
+
+    # Missing fields are read as all-NaN below; the caller's frame is left untouched.
+    for c in _CHAIN_COLUMNS:
         if c not in options_df.columns:
-            options_df[c] = np.nan
             logger.info("%s %s %s: missing field '%s', using fallback", ticker, strategy, expiration, c)
 
-    for _, r in options_df.iterrows():
-        strike = safe_float(r.get("strike"))
-        bid = safe_float(r.get("bid"), 0.0) or 0.0
-        ask = safe_float(r.get("ask"), 0.0) or 0.0
-        volume = int(safe_float(r.get("volume"), 0) or 0)
-        oi = int(safe_float(r.get("openInterest"), 0) or 0)
-        iv = safe_float(r.get("impliedVolatility"))
-        contract_symbol = str(r.get("contractSymbol") or "")
+    numerics, viable = _chain_numerics(options_df, strategy, spot, dte, min_ann)
+    # Pull the remaining per-contract fields column-wise rather than through iterrows(),
+    # which builds a Series for every row of the chain.
+    volumes = [int(v or 0) for v in _optional_floats(options_df, "volume")]
+    open_interests = [int(v or 0) for v in _optional_floats(options_df, "openInterest")]
+    ivs = _optional_floats(options_df, "impliedVolatility")
+    last_prices = _optional_floats(options_df, "lastPrice")
+    provided_deltas = _optional_floats(options_df, "delta")
+    if "contractSymbol" in options_df.columns:
+        contract_symbols = [str(v or "") for v in options_df["contractSymbol"].tolist()]
+    else:
+        contract_symbols = [""] * len(options_df)
+
+    if decision_logger is None:
+        # No per-contract decisions are recorded, so only visit contracts that pass
+        # the cheap vectorized filters; the checks below still apply to them.
+        positions: Iterable[int] = np.flatnonzero(viable).tolist()
+    else:
+        positions = range(len(options_df))
+
+    for i in positions:
+        strike = numerics["strike"][i]
+        bid = numerics["bid"][i]
+        ask = numerics["ask"][i]
+        volume = volumes[i]
+        oi = open_interests[i]
+        iv = ivs[i]
+        contract_symbol = contract_symbols[i]
 
         def _log_decision(filtered: bool, reason: str) -> None:
             if decision_logger is None:
@@ -219,13 +340,13 @@ def build_option_records(
             decision_logger(
                 {
                     "event": "screening_decision",
-                    "expiration": expiration.isoformat(),
+                    "expiration": expiration_str,
                     "option_type": strategy,
                     "contractSymbol": contract_symbol,
                     "strike": strike,
                     "bid": bid,
                     "ask": ask,
-                    "lastPrice": safe_float(r.get("lastPrice")),
+                    "lastPrice": last_prices[i],
                     "volume": volume,
                     "openInterest": oi,
                     "impliedVolatility": iv,
@@ -242,40 +363,35 @@ def build_option_records(
             _log_decision(True, "invalid_bid_ask")
             continue
 
-        sp = spread_pct(bid, ask)
+        sp = numerics["spread_pct"][i]
         if sp is None:
             _log_decision(True, "invalid_spread")
             continue
-        if min_oi is not None and oi < int(min_oi):
-            _log_decision(True, f"open_interest_below_min:{oi}<{int(min_oi)}")
+        if min_oi_int is not None and oi < min_oi_int:
+            _log_decision(True, f"open_interest_below_min:{oi}<{min_oi_int}")
             continue
-        if min_vol is not None and volume < int(min_vol):
-            _log_decision(True, f"volume_below_min:{volume}<{int(min_vol)}")
+        if min_vol_int is not None and volume < min_vol_int:
+            _log_decision(True, f"volume_below_min:{volume}<{min_vol_int}")
             continue
-        if max_sp is not None and sp > float(max_sp):
-            _log_decision(True, f"spread_above_max:{sp:.6f}>{float(max_sp):.6f}")
+        if max_sp is not None and sp > max_sp:
+            _log_decision(True, f"spread_above_max:{sp:.6f}>{max_sp:.6f}")
             continue
 
-        mid = (bid + ask) / 2.0
-        ann_yield = annualized_yield(strategy, mid, strike, spot, dte)
-        if ann_yield is None or ann_yield < float(config["min_annualized_yield"]):
+        mid = numerics["mid"][i]
+        ann_yield = numerics["annualized_yield"][i]
+        if ann_yield is None or ann_yield < min_ann:
             _log_decision(
                 True,
-                f"annualized_yield_below_min:{0.0 if ann_yield is None else ann_yield:.6f}<"
-                f"{float(config['min_annualized_yield']):.6f}",
+                f"annualized_yield_below_min:{0.0 if ann_yield is None else ann_yield:.6f}<{min_ann:.6f}",
             )
             continue
 
-        if strategy == "PUT":
-            otm_pct = (spot - strike) / spot if spot > 0 else None
-        else:
-            otm_pct = (strike - spot) / spot if spot > 0 else None
-
+        otm_pct = numerics["otm_pct"][i]
         if otm_pct is not None and otm_pct < 0:
             _log_decision(True, f"not_otm:{otm_pct:.6f}")
             continue
 
-        delta_raw = safe_float(r.get("delta"))
+        delta_raw = provided_deltas[i]
         delta_source = "provided"
         if delta_raw is None:
             bs_delta = None
@@ -294,7 +410,7 @@ def build_option_records(
             else:
                 delta_source = "otm_fallback"
 
-        if not _passes_delta_or_otm(strategy, delta_raw, otm_pct, config):
+        if not _passes_delta_or_otm(delta_raw, otm_pct, delta_bounds, otm_bounds):
             _log_decision(
                 True,
                 "delta_or_otm_out_of_range"
@@ -308,8 +424,6 @@ def build_option_records(
             delta_raw = 0.0
             missing_delta_count += 1
 
-        earnings_before_expiry = earnings_date is not None and earnings_date <= expiration and earnings_date >= today
-
         # Max profit at expiry (per contract = 100 shares):
         #   PUT  → keep full premium if stock stays above strike
         #   CALL → premium + (strike − spot) upside if assigned at strike
@@ -319,11 +433,11 @@ def build_option_records(
             max_profit_val = round((strike - spot + mid) * 100, 2) if spot > 0 else None
 
         record = {
-            "run_date": today.isoformat(),
+            "run_date": run_date_str,
             "ticker": ticker,
             "bucket": bucket_name,
             "bucket_label": bucket_label,
-            "expiration": expiration.isoformat(),
+            "expiration": expiration_str,
             "strategy": strategy,
             "contract_symbol": contract_symbol,
             "spot": round(spot, 4),
@@ -342,7 +456,7 @@ def build_option_records(
             "breakeven": round(breakeven(strategy, strike, spot, mid), 4),
             "max_profit": max_profit_val,
             "otm_pct": round(otm_pct, 6) if otm_pct is not None else None,
-            "earnings_date": earnings_date.isoformat() if earnings_date else "",
+            "earnings_date": earnings_date_str,
             "earnings_before_expiry": earnings_before_expiry,
             "ma20": technicals["ma20"],
             "ma50": technicals["ma50"],
@@ -356,7 +470,7 @@ def build_option_records(
         logger.warning(
             "%s %s %s: delta missing for %d/%d candidate(s) — defaulted to 0. "
             "Set risk_free_rate in config.yaml to enable Black-Scholes delta calculation.",
-            ticker, strategy, expiration.isoformat(), missing_delta_count, len(rows),
+            ticker, strategy, expiration_str, missing_delta_count, len(rows),
         )
 
     return rows
@@ -1,33 +1,64 @@
 ﻿from __future__ import annotations
 
+import math
 from typing import Dict
 
 import numpy as np
 import pandas as pd
 
 
+_RSI_ALPHA = 1 / 14
+
+
+def _wilder_average(values: np.ndarray, min_periods: int = 14) -> float:
+    """
+    Last value of Series.ewm(alpha=1/14, min_periods=14, adjust=False).mean().
+
+    Follows pandas' recursion step for step (including how NaN gaps decay the
+    prior weight), so the result is bit-for-bit the same without building the
+    whole smoothed series.
+    """
+    old_wt_factor = 1.0 - _RSI_ALPHA
+    weighted = math.nan
+    old_wt = 1.0
+    nobs = 0
+    for cur in values.tolist():
+        is_observation = cur == cur
+        nobs += is_observation
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + _RSI_ALPHA * cur) / (old_wt + _RSI_ALPHA)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+    return weighted if nobs >= min_periods else math.nan
+
+
 def compute_technicals(price_df: pd.DataFrame) -> Dict[str, float]:
-    close = price_df["Close"].astype(float).copy()
+    # Only the latest value of each indicator is used, so work on the raw array
+    # instead of building full rolling/ewm Series just to take .iloc[-1].
+    close = price_df["Close"].to_numpy(dtype=float)
+    spot = float(close[-1])
 
-    ma20 = close.rolling(20).mean().iloc[-1]
-    ma50 = close.rolling(50).mean().iloc[-1]
+    ma20 = float(close[-20:].mean()) if len(close) >= 20 else math.nan
+    ma50 = float(close[-50:].mean()) if len(close) >= 50 else math.nan
 
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
+    delta = np.diff(close)
     # Wilder's smoothing (alpha=1/14) matches RSI values shown on most platforms
-    avg_gain = gain.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
-    rs = avg_gain / avg_loss.replace(0, np.nan)
-    rsi = 100 - (100 / (1 + rs))
+    avg_gain = _wilder_average(np.clip(delta, 0.0, None))
+    avg_loss = _wilder_average(-np.clip(delta, None, 0.0))
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss)) if avg_loss else math.nan
 
-    ret = close.pct_change().dropna()
-    hv20 = ret.rolling(20).std().iloc[-1] * np.sqrt(252) if len(ret) >= 20 else np.nan
+    ret = close[1:] / close[:-1] - 1.0
+    ret = ret[~np.isnan(ret)]
+    hv20 = float(ret[-20:].std(ddof=1)) * math.sqrt(252) if len(ret) >= 20 else math.nan
 
     return {
-        "spot": float(close.iloc[-1]),
-        "ma20": float(ma20) if pd.notna(ma20) else float(close.iloc[-1]),
-        "ma50": float(ma50) if pd.notna(ma50) else float(close.iloc[-1]),
-        "rsi14": float(rsi.iloc[-1]) if pd.notna(rsi.iloc[-1]) else 50.0,
-        "hv20": float(hv20) if pd.notna(hv20) else 0.25,
+        "spot": spot,
+        "ma20": ma20 if not math.isnan(ma20) else spot,
+        "ma50": ma50 if not math.isnan(ma50) else spot,
+        "rsi14": rsi if not math.isnan(rsi) else 50.0,
+        "hv20": hv20 if not math.isnan(hv20) else 0.25,
     }
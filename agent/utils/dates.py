@@ -1,13 +1,8 @@
 ﻿from __future__ import annotations
 
-from datetime import date, timedelta
+from datetime import date
 
 
 def is_third_friday(d: date) -> bool:
-    if d.weekday() != 4:
-        return False
-    first_day = d.replace(day=1)
-    first_friday_offset = (4 - first_day.weekday()) % 7
-    first_friday = first_day + timedelta(days=first_friday_offset)
-    third_friday = first_friday + timedelta(days=14)
-    return d == third_friday
+    # The third Friday of any month always falls on day 15-21.
+    return d.weekday() == 4 and 15 <= d.day <= 21
@@ -5,11 +5,12 @@ from pathlib import Path
 
 
 def load_dotenv_if_present(path: str = ".env") -> None:
-    env_path = Path(path)
-    if not env_path.exists():
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except FileNotFoundError:
         return
 
-    for raw in env_path.read_text(encoding="utf-8").splitlines():
+    for raw in text.splitlines():
         line = raw.strip()
         if not line or line.startswith("#"):
             continue
@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 import logging
+import logging.handlers
 from pathlib import Path
 from typing import Any, Dict
 
@@ -20,7 +21,11 @@ def setup_logging(config: Dict[str, Any]) -> logging.Logger:
 
     file_handler = logging.FileHandler(log_file, encoding="utf-8")
     file_handler.setFormatter(fmt)
-    logger.addHandler(file_handler)
+    # FileHandler flushes after every record; batch INFO records and write them out
+    # on any warning/error, when the buffer fills, or at interpreter shutdown.
+    logger.addHandler(
+        logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.WARNING, target=file_handler)
+    )
 
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(fmt)
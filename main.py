@@ -7,6 +7,11 @@ from typing import Any, Dict, Iterable
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 from agent.providers.factory import build_options_provider
 from agent.pipeline import DEFAULT_CONFIG, run_pipeline
 from agent.utils.env import load_dotenv_if_present
@@ -65,7 +70,7 @@ def _deep_merge_dicts(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[st
 
 def _load_yaml_dict(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
-        loaded = yaml.safe_load(f) or {}
+        loaded = yaml.load(f, Loader=_YamlLoader) or {}
     if not isinstance(loaded, dict):
         raise ValueError(f"Config YAML must parse to a dictionary: {path}")
     return loaded